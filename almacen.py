@@ -0,0 +1,175 @@
+"""Almacén columnar de datasets semanales.
+
+Cada semana publicada es un directorio con una tabla Arrow IPC por dataset, y
+``indice.json`` lista las semanas disponibles (la más reciente primero)::
+
+    archivo/
+        indice.json
+        2025-03-01/
+            temas.arrow
+            paises.arrow
+            ...
+
+Las tablas se abren con ``pyarrow.memory_map``: leerlas no copia el archivo en
+memoria, y sólo se abren las tablas que se piden, de modo que un proceso puede
+servir un archivo histórico de varios años sin cargarlo completo.
+
+Uso (publicar una semana desde un directorio con un JSON por tabla, en formato
+lista de registros)::
+
+    python almacen.py publicar 2025-03-08 "Semana del 08 al 14 de marzo, 2025" fuentes/
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from perfil import diferido
+
+# Leer el índice no requiere pyarrow; se importa al abrir la primera tabla
+pa = diferido("pyarrow")
+
+RAIZ = Path(os.environ.get("MONITOR_ARCHIVO", Path(__file__).resolve().parent / "archivo"))
+INDICE = "indice.json"
+
+_candado = threading.Lock()
+_indice_cache = {}
+
+
+def leer_indice(raiz=RAIZ):
+    """Semanas publicadas, de la más reciente a la más antigua.
+
+    Se relee sólo cuando cambia la fecha de modificación de ``indice.json``.
+    """
+    ruta = Path(raiz) / INDICE
+    mtime = ruta.stat().st_mtime_ns
+    with _candado:
+        cacheado = _indice_cache.get(ruta)
+        if cacheado is None or cacheado[0] != mtime:
+            with open(ruta, encoding="utf-8") as f:
+                semanas = json.load(f)["semanas"]
+            semanas.sort(key=lambda s: s["id"], reverse=True)
+            cacheado = _indice_cache[ruta] = (mtime, semanas)
+    return cacheado[1]
+
+
+def buscar_semana(semana_id, raiz=RAIZ):
+    for semana in leer_indice(raiz):
+        if semana["id"] == semana_id:
+            return semana
+    raise KeyError(f"Semana no publicada: {semana_id}")
+
+
+def abrir_tabla(semana_id, nombre, raiz=RAIZ):
+    """Abre una tabla de la semana como ``pyarrow.Table`` respaldada por mmap."""
+    ruta = Path(raiz) / semana_id / f"{nombre}.arrow"
+    try:
+        fuente = pa.memory_map(str(ruta), "r")
+    except FileNotFoundError:
+        # Puede estar republicándose (ver ``publicar_semana``)
+        time.sleep(0.05)
+        fuente = pa.memory_map(str(ruta), "r")
+    with fuente:
+        return pa.ipc.open_file(fuente).read_all()
+
+
+def publicar_semana(semana, tablas, raiz=RAIZ):
+    """Escribe las tablas de una semana y la agrega (o reemplaza) en el índice.
+
+    ``semana`` es la entrada del índice (``id``, ``periodo``, ...) y ``tablas``
+    un dict nombre -> DataFrame. Las tablas se escriben en un directorio
+    temporal que se renombra al final, para que un lector nunca vea una semana
+    a medio escribir. Al republicar, la versión anterior se aparta con un
+    renombrado y se borra recién después de poner la nueva en su lugar: la
+    semana sólo falta entre esos dos renombrados, y ``abrir_tabla`` reintenta
+    una vez si cae justo ahí. Las tablas ya mapeadas por un lector siguen
+    siendo válidas aunque se borre su directorio.
+
+    Cada publicación incrementa la ``version`` de la semana en el índice: es
+    parte de la clave de caché de sus datos (ver ``datos.DatosSemana``), y un
+    servidor en marcha toma la semana republicada en la próxima corrida.
+    """
+    raiz = Path(raiz)
+    raiz.mkdir(parents=True, exist_ok=True)
+    destino = raiz / semana["id"]
+    temporal = Path(tempfile.mkdtemp(prefix=f".{semana['id']}-", dir=raiz))
+    os.chmod(temporal, 0o755)
+    for nombre, df in tablas.items():
+        tabla = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.OSFile(str(temporal / f"{nombre}.arrow"), "wb") as sumidero:
+            with pa.ipc.new_file(sumidero, tabla.schema) as escritor:
+                escritor.write_table(tabla)
+    if destino.exists():
+        viejo = Path(tempfile.mkdtemp(prefix=f".{semana['id']}-viejo-", dir=raiz))
+        os.replace(destino, viejo / semana["id"])
+        os.replace(temporal, destino)
+        shutil.rmtree(viejo)
+    else:
+        os.replace(temporal, destino)
+
+    ruta_indice = raiz / INDICE
+    semanas = []
+    if ruta_indice.exists():
+        with open(ruta_indice, encoding="utf-8") as f:
+            semanas = json.load(f)["semanas"]
+    anterior = next((s for s in semanas if s["id"] == semana["id"]), {})
+    semanas = [s for s in semanas if s["id"] != semana["id"]]
+    semanas.append({**semana, "version": anterior.get("version", 0) + 1})
+    semanas.sort(key=lambda s: s["id"], reverse=True)
+    temporal = ruta_indice.with_suffix(".tmp")
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump({"semanas": semanas}, f, ensure_ascii=False, indent=2)
+    os.replace(temporal, ruta_indice)
+
+
+def reemplazar_tablas(semana_id, tablas, raiz=RAIZ):
+    """Vuelve a publicar una semana con algunas tablas reemplazadas por ``tablas``."""
+    semana = buscar_semana(semana_id, raiz)
+    todas = {ruta.stem: abrir_tabla(semana_id, ruta.stem, raiz).to_pandas()
+             for ruta in (Path(raiz) / semana_id).glob("*.arrow")}
+    todas.update(tablas)
+    publicar_semana(semana, todas, raiz)
+
+
+def _publicar_desde_json(args):
+    import pandas as pd
+
+    tablas = {}
+    for ruta in sorted(Path(args.fuentes).glob("*.json")):
+        with open(ruta, encoding="utf-8") as f:
+            tablas[ruta.stem] = pd.DataFrame(json.load(f))
+    semana = {"id": args.id, "periodo": args.periodo}
+    if args.actualizado:
+        semana["actualizado"] = args.actualizado
+    publicar_semana(semana, tablas, args.raiz)
+    print(f"Semana {args.id} publicada con {len(tablas)} tablas en {args.raiz}")
+
+
+def _listar(args):
+    for semana in leer_indice(args.raiz):
+        print(semana["id"], semana["periodo"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Almacén de datasets semanales del reporte.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    publicar = sub.add_parser("publicar", help="Publica una semana desde archivos JSON.")
+    publicar.add_argument("id", help="Identificador de la semana (fecha de inicio, AAAA-MM-DD).")
+    publicar.add_argument("periodo", help='Texto del período, p. ej. "Semana del 01 al 7 de marzo, 2025".')
+    publicar.add_argument("fuentes", help="Directorio con un <tabla>.json por tabla.")
+    publicar.add_argument("--actualizado", help="Fecha de actualización de los datos, para el pie de página.")
+    publicar.add_argument("--raiz", default=RAIZ)
+    publicar.set_defaults(func=_publicar_desde_json)
+    listar = sub.add_parser("listar", help="Lista las semanas publicadas.")
+    listar.add_argument("--raiz", default=RAIZ)
+    listar.set_defaults(func=_listar)
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Benchmark del render del reporte, por sección y por interacción.
+
+Ejecuta ``output.py`` sin navegador con el arnés de pruebas de Streamlit
+(``AppTest``) y mide:
+
+- ``arranque``: la primera corrida del proceso (importaciones y cachés frías),
+  de la página de inicio;
+- ``seccion:<nombre>``: cada una de las cuatro secciones en corridas con caché
+  caliente, a partir de los cronómetros de ``perfil.py``;
+- ``corrida``: el reporte completo con caché caliente, es decir, una corrida de
+  cada página (ver ``paginas/``) una tras otra; antes de medir se corre cada
+  página una vez, para que ninguna repetición pague importaciones o cachés
+  frías de las páginas que no son la de inicio;
+- ``interaccion:paises``: cada cambio de país en el selectbox, recorriendo
+  todos los países;
+- ``memoria:<escenario>``: el pico de memoria de Python (tracemalloc) de cada
+  escenario, en MB.
+
+Los resultados se comparan con ``baseline.json``: una métrica que empeora más
+que la tolerancia hace fallar la corrida (código de salida 1).
+
+Uso:
+    python benchmarks/bench_reporte.py [--repeticiones N] [--tolerancia 0.25]
+    python benchmarks/bench_reporte.py --actualizar-baseline
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+RAIZ = Path(__file__).resolve().parent.parent
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+ETIQUETA_PAIS = "Seleccione un país para más detalles:"
+SECCIONES = ["1. Principales Temas", "2. Detalle de Implicancias", "3. Detalle por Países", "4. Áreas Críticas"]
+# La de países va al final: las interacciones se miden sobre ella después de una corrida
+PAGINAS = ["paginas/resumen.py", "paginas/temas.py", "paginas/implicancias.py", "paginas/areas.py", "paginas/paises.py"]
+
+# Holgura absoluta: diferencias menores son ruido de medición
+HOLGURA_MS = 5.0
+HOLGURA_MB = 1.0
+
+sys.path.insert(0, str(RAIZ))
+import perfil  # noqa: E402
+
+
+def _nueva_app():
+    return AppTest.from_file(str(RAIZ / "output.py"), default_timeout=120)
+
+
+def _correr(at):
+    at.run()
+    if at.exception:
+        raise RuntimeError(f"El reporte falló: {at.exception[0].value}")
+
+
+def _correr_paginas(at):
+    for pagina in PAGINAS:
+        at.switch_page(pagina)
+        _correr(at)
+
+
+def _selectbox_pais(at):
+    return next(s for s in at.selectbox if s.label == ETIQUETA_PAIS)
+
+
+def _ciclar_paises(at):
+    tiempos = []
+    for pais in _selectbox_pais(at).options:
+        inicio = time.perf_counter()
+        _selectbox_pais(at).select(pais).run()
+        tiempos.append(time.perf_counter() - inicio)
+        if at.exception:
+            raise RuntimeError(f"El reporte falló al elegir {pais}: {at.exception[0].value}")
+    return tiempos
+
+
+def medir_tiempos(repeticiones):
+    muestras = defaultdict(list)
+
+    def registrar(seccion, segundos, rss_delta, interaccion):
+        if seccion in SECCIONES:
+            muestras[f"seccion:{seccion}"].append(segundos)
+
+    at = _nueva_app()
+    inicio = time.perf_counter()
+    _correr(at)
+    muestras["arranque"].append(time.perf_counter() - inicio)
+    # El arranque sólo corre la página de inicio: las demás se calientan aquí
+    _correr_paginas(at)
+
+    perfil.observar(registrar)
+    try:
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            _correr_paginas(at)
+            muestras["corrida"].append(time.perf_counter() - inicio)
+        for _ in range(repeticiones):
+            muestras["interaccion:paises"] += _ciclar_paises(at)
+    finally:
+        perfil.dejar_de_observar(registrar)
+
+    return {nombre: statistics.median(valores) * 1000 for nombre, valores in muestras.items()}
+
+
+def medir_memoria():
+    escenarios = {
+        "corrida": _correr_paginas,
+        "interaccion:paises": _ciclar_paises,
+    }
+    resultados = {}
+    at = _nueva_app()
+    _correr(at)
+    _correr_paginas(at)
+    tracemalloc.start()
+    try:
+        for nombre, escenario in escenarios.items():
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            escenario(at)
+            resultados[f"memoria:{nombre}"] = (tracemalloc.get_traced_memory()[1] - base) / 2**20
+    finally:
+        tracemalloc.stop()
+    return resultados
+
+
+def comparar(actual, baseline, tolerancia):
+    """Métricas que empeoraron más allá de la tolerancia."""
+    regresiones = []
+    for nombre, referencia in baseline["metricas"].items():
+        if nombre not in actual:
+            continue
+        holgura = HOLGURA_MB if nombre.startswith("memoria:") else HOLGURA_MS
+        limite = referencia * (1 + tolerancia) + holgura
+        if actual[nombre] > limite:
+            regresiones.append((nombre, referencia, actual[nombre], limite))
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="Empeoramiento relativo admitido respecto del baseline (0.25 = 25%%).")
+    parser.add_argument("--actualizar-baseline", action="store_true",
+                        help="Guarda los resultados como nuevo baseline en vez de comparar.")
+    args = parser.parse_args()
+
+    metricas = medir_tiempos(args.repeticiones)
+    metricas.update(medir_memoria())
+
+    for nombre, valor in sorted(metricas.items()):
+        unidad = "MB" if nombre.startswith("memoria:") else "ms"
+        print(f"{nombre:<40} {valor:9.1f} {unidad}")
+
+    if args.actualizar_baseline or not BASELINE.exists():
+        BASELINE.write_text(json.dumps({
+            "maquina": f"{platform.node()} / Python {platform.python_version()}",
+            "metricas": {nombre: round(valor, 2) for nombre, valor in sorted(metricas.items())},
+        }, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline guardado en {BASELINE}")
+        return 0
+
+    regresiones = comparar(metricas, json.loads(BASELINE.read_text(encoding="utf-8")), args.tolerancia)
+    for nombre, referencia, valor, limite in regresiones:
+        print(f"REGRESIÓN {nombre}: {valor:.1f} (baseline {referencia:.1f}, límite {limite:.1f})")
+    if regresiones:
+        return 1
+    print("Sin regresiones respecto del baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
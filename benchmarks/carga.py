@@ -0,0 +1,148 @@
+"""Prueba de carga: latencia, rendimiento, CPU y memoria según la concurrencia.
+
+Levanta el reporte con ``streamlit run`` y, para cada nivel de concurrencia,
+abre a la vez esa cantidad de sesiones de navegador simuladas (ver
+``servidor.Sesion``). Cada sesión hace lo que hace un espectador típico tras
+la publicación semanal:
+
+1. carga el reporte (Resumen Ejecutivo);
+2. va a "3. Detalle por Países" y recorre países en el selectbox del detalle;
+3. va a "2. Detalle de Implicancias" y pasa por todas las pestañas;
+
+y repite ese recorrido ``--ciclos`` veces. Se mide cada interacción, desde
+que se envía el pedido hasta que termina el rerun, y por nivel se informan
+los percentiles 50/95/99 de la latencia, las interacciones por segundo, la
+CPU del servidor (en núcleos: segundos de CPU por segundo de reloj) y su
+memoria residente al final y máxima durante el nivel.
+
+Los niveles corren sobre el mismo servidor, del menor al mayor, así que las
+cachés compartidas ya están llenas desde el segundo nivel. Todas las sesiones
+salen de un solo proceso cliente; con cientos de sesiones conviene comprobar
+que el cliente no sea el cuello de botella (su CPU debe quedar bajo un núcleo).
+
+Uso:
+    python benchmarks/carga.py [--sesiones 1 5 10 20 40] [--ciclos 2] [--paises 5] [--json curva.json]
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from servidor import Servidor, Sesion  # noqa: E402
+
+MB = 2 ** 20
+PAISES = "3. Detalle por Países"
+IMPLICANCIAS = "2. Detalle de Implicancias"
+ETIQUETA_PAIS = "Seleccione un país para más detalles:"
+PESTANAS = ("Comercio", "Inversión", "Migración", "Seguridad")
+
+
+async def espectador(url_ws, ciclos, paises, tiempos):
+    """Una sesión que recorre el reporte; agrega ``(interacción, segundos)`` a ``tiempos``."""
+    sesion = Sesion(url_ws)
+    await sesion.conectar()
+    try:
+        tiempos.append(("carga", await sesion.correr()))
+        for _ in range(ciclos):
+            sesion.ir(PAISES)
+            tiempos.append(("página", await sesion.correr()))
+            opciones = list(sesion.widgets[ETIQUETA_PAIS].options)
+            for pais in (opciones[1:] + opciones[:1])[:paises]:
+                sesion.elegir(ETIQUETA_PAIS, pais)
+                tiempos.append(("país", await sesion.correr(sesion.fragmentos[ETIQUETA_PAIS])))
+            sesion.ir(IMPLICANCIAS)
+            tiempos.append(("página", await sesion.correr()))
+            for pestana in PESTANAS[1:] + PESTANAS[:1]:
+                sesion.abrir_pestana(pestana)
+                tiempos.append(("pestaña", await sesion.correr(sesion.fragmentos[pestana])))
+        if sesion.errores:
+            raise RuntimeError(f"El reporte falló: {sesion.errores[0]}")
+    finally:
+        await sesion.cerrar()
+
+
+async def _vigilar_memoria(servidor, maximos, intervalo=0.1):
+    while True:
+        maximos.append(servidor.memoria())
+        await asyncio.sleep(intervalo)
+
+
+def _percentil(ordenados, p):
+    return ordenados[round(p / 100 * (len(ordenados) - 1))]
+
+
+async def nivel(servidor, sesiones, ciclos, paises):
+    """Corre ``sesiones`` espectadores a la vez y resume lo medido."""
+    tiempos, memoria = [], []
+    vigia = asyncio.create_task(_vigilar_memoria(servidor, memoria))
+    cpu, inicio = servidor.cpu(), time.perf_counter()
+    try:
+        await asyncio.gather(*(espectador(servidor.url_ws, ciclos, paises, tiempos) for _ in range(sesiones)))
+    finally:
+        duracion = time.perf_counter() - inicio
+        cpu = servidor.cpu() - cpu
+        vigia.cancel()
+    latencias = sorted(segundos for _, segundos in tiempos)
+    por_tipo = {}
+    for tipo, segundos in tiempos:
+        por_tipo.setdefault(tipo, []).append(segundos)
+    return {
+        "sesiones": sesiones,
+        "interacciones": len(tiempos),
+        "duracion_s": round(duracion, 2),
+        "por_segundo": round(len(tiempos) / duracion, 2),
+        "p50_ms": round(_percentil(latencias, 50) * 1000, 1),
+        "p95_ms": round(_percentil(latencias, 95) * 1000, 1),
+        "p99_ms": round(_percentil(latencias, 99) * 1000, 1),
+        "p95_por_tipo_ms": {tipo: round(_percentil(sorted(valores), 95) * 1000, 1)
+                            for tipo, valores in por_tipo.items()},
+        "cpu_nucleos": round(cpu / duracion, 2),
+        "memoria_mb": round(servidor.memoria() / MB, 1),
+        "memoria_max_mb": round(max(memoria, default=0) / MB, 1),
+    }
+
+
+async def curva(servidor, niveles, ciclos, paises):
+    resultados = []
+    for sesiones in niveles:
+        resultado = await nivel(servidor, sesiones, ciclos, paises)
+        _imprimir(resultado, encabezado=not resultados)
+        resultados.append(resultado)
+        await asyncio.sleep(1)  # deja que el servidor cierre las sesiones del nivel
+    return resultados
+
+
+def _imprimir(r, encabezado=False):
+    if encabezado:
+        print(f"{'sesiones':>8} {'interac.':>8} {'por s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+              f" {'CPU':>5} {'RSS MB':>7} {'máx MB':>7}   p95 por interacción (ms)")
+    tipos = "  ".join(f"{tipo} {ms:.0f}" for tipo, ms in r["p95_por_tipo_ms"].items())
+    print(f"{r['sesiones']:>8} {r['interacciones']:>8} {r['por_segundo']:>7.1f} {r['p50_ms']:>8.1f}"
+          f" {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['cpu_nucleos']:>5.2f} {r['memoria_mb']:>7.1f}"
+          f" {r['memoria_max_mb']:>7.1f}   {tipos}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sesiones", type=int, nargs="+", default=[1, 5, 10, 20, 40],
+                        help="Niveles de concurrencia, en orden.")
+    parser.add_argument("--ciclos", type=int, default=2, help="Recorridos del reporte por sesión.")
+    parser.add_argument("--paises", type=int, default=5, help="Países que elige cada sesión por recorrido.")
+    parser.add_argument("--json", type=Path, help="Guarda la curva en este archivo, para comparar entre publicaciones.")
+    args = parser.parse_args()
+
+    with Servidor() as servidor:
+        print(f"servidor sin sesiones: {servidor.memoria() / MB:.1f} MB\n")
+        resultados = asyncio.run(curva(servidor, sorted(args.sesiones), args.ciclos, args.paises))
+
+    if args.json:
+        args.json.write_text(json.dumps({"ciclos": args.ciclos, "paises": args.paises, "niveles": resultados},
+                                        ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"\nCurva guardada en {args.json}")
+
+
+if __name__ == "__main__":
+    main()
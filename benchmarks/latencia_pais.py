@@ -0,0 +1,70 @@
+"""Latencia por interacción al cambiar de país en "3. Detalle por Países".
+
+Compara el costo de un rerun completo de la página (comportamiento anterior al
+fragmento: el selectbox re-ejecutaba ``output.py`` con el encabezado, la barra
+lateral y toda la página de países, ``paginas/paises.py``) con el de
+re-ejecutar sólo el fragmento ``secciones.detalle_pais``.
+
+Uso:
+    python benchmarks/latencia_pais.py [--vueltas N]
+"""
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+RAIZ = Path(__file__).resolve().parent.parent
+ETIQUETA = "Seleccione un país para más detalles:"
+
+
+def _solo_detalle_pais(raiz):
+    import sys
+    sys.path.insert(0, raiz)
+    import almacen
+    from datos import cargar_datos
+    from secciones import detalle_pais
+
+    datos = cargar_datos(almacen.leer_indice()[0]['id'])
+    detalle_pais("bench", datos['paises_data'], datos['country_data'], datos['impacto'],
+                 datos['textos']['recomendaciones'])
+
+
+def _ciclar_paises(at, vueltas):
+    tiempos = []
+    for _ in range(vueltas):
+        selectbox = next(s for s in at.selectbox if s.label == ETIQUETA)
+        for pais in selectbox.options:
+            selectbox = next(s for s in at.selectbox if s.label == ETIQUETA)
+            inicio = time.perf_counter()
+            selectbox.select(pais).run()
+            tiempos.append(time.perf_counter() - inicio)
+            assert not at.exception, at.exception
+    return tiempos
+
+
+def _resumen(nombre, tiempos):
+    tiempos = sorted(tiempos)
+    p95 = tiempos[int(0.95 * (len(tiempos) - 1))]
+    print(f"{nombre:<28} mediana {statistics.median(tiempos) * 1000:8.1f} ms"
+          f"   p95 {p95 * 1000:8.1f} ms   n={len(tiempos)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vueltas", type=int, default=3)
+    args = parser.parse_args()
+
+    completo = AppTest.from_file(str(RAIZ / "output.py"), default_timeout=120)
+    completo.run()
+    completo.switch_page("paginas/paises.py").run()
+    fragmento = AppTest.from_function(_solo_detalle_pais, args=(str(RAIZ),), default_timeout=120)
+    fragmento.run()
+
+    _resumen("antes: rerun de la página", _ciclar_paises(completo, args.vueltas))
+    _resumen("después: fragmento país", _ciclar_paises(fragmento, args.vueltas))
+
+
+if __name__ == "__main__":
+    main()
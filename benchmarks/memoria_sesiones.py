@@ -0,0 +1,76 @@
+"""Memoria residente del servidor por cada sesión adicional.
+
+Levanta el reporte con ``streamlit run`` y abre sesiones de a una (como
+pestañas de navegador que quedan abiertas), cada una con su corrida completa:
+la página de inicio y después cada una de las páginas de la barra
+lateral, de modo que el estado de sesión incluye el de todas las secciones.
+Después de cada sesión se mide la memoria residente del servidor; el costo
+marginal es la pendiente de la recta ajustada por mínimos cuadrados, sin contar
+la primera sesión (que paga las importaciones y llena las cachés compartidas).
+
+Con esa pendiente se estima la memoria de un pod para la cantidad de
+espectadores esperada tras la publicación semanal.
+
+Uso:
+    python benchmarks/memoria_sesiones.py [--sesiones 40] [--estimar 100 300 500]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from servidor import Servidor, Sesion  # noqa: E402
+
+MB = 2 ** 20
+
+
+async def medir(servidor, cantidad):
+    """Memoria residente del servidor después de abrir cada una de ``cantidad`` sesiones."""
+    sesiones, memoria = [], [servidor.memoria()]
+    try:
+        for _ in range(cantidad):
+            sesion = Sesion(servidor.url_ws)
+            await sesion.conectar()
+            await sesion.correr()
+            for pagina in sesion.paginas:
+                sesion.ir(pagina)
+                await sesion.correr()
+            if sesion.errores:
+                raise RuntimeError(f"El reporte falló: {sesion.errores[0]}")
+            sesiones.append(sesion)
+            await asyncio.sleep(0.2)  # deja que el servidor termine de enviar y liberar
+            memoria.append(servidor.memoria())
+    finally:
+        for sesion in sesiones:
+            await sesion.cerrar()
+    return memoria
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sesiones", type=int, default=40)
+    parser.add_argument("--estimar", type=int, nargs="*", default=[100, 300, 500],
+                        help="Cantidades de sesiones para las que estimar la memoria del pod.")
+    args = parser.parse_args()
+    if args.sesiones < 3:
+        # La pendiente se ajusta desde la segunda sesión: hacen falta dos puntos
+        parser.error("--sesiones debe ser al menos 3")
+
+    with Servidor() as servidor:
+        memoria = asyncio.run(medir(servidor, args.sesiones))
+
+    base, primera = memoria[0] / MB, memoria[1] / MB
+    n = list(range(1, len(memoria)))
+    pendiente, ordenada = statistics.linear_regression(n[1:], [m / MB for m in memoria[2:]])
+    print(f"servidor sin sesiones        {base:8.1f} MB")
+    print(f"con la primera sesión        {primera:8.1f} MB")
+    print(f"con {args.sesiones} sesiones{' ' * (17 - len(str(args.sesiones)))}{memoria[-1] / MB:8.1f} MB")
+    print(f"por sesión adicional         {pendiente * 1024:8.1f} KB")
+    for cantidad in args.estimar:
+        print(f"estimado para {cantidad:>4} sesiones   {ordenada + pendiente * cantidad:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Servidor de Streamlit y sesiones de navegador simuladas, para los benchmarks.
+
+``Servidor`` levanta ``streamlit run output.py`` en un puerto libre y expone
+la memoria residente y el tiempo de CPU del proceso (leídos de ``/proc``).
+``Sesion`` habla el mismo protocolo que el navegador: un websocket en
+``/_stcore/stream`` por el que viajan ``BackMsg`` (pedidos de rerun con el
+estado de los widgets) y ``ForwardMsg`` (los deltas del script), en protobuf.
+"""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+RAIZ = Path(__file__).resolve().parent.parent
+_TICKS = os.sysconf("SC_CLK_TCK")
+
+
+def _puerto_libre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class Servidor:
+    """``streamlit run`` en un subproceso, mientras dure el bloque ``with``."""
+
+    def __init__(self, script="output.py", entorno=None, espera=60):
+        self.puerto = _puerto_libre()
+        self.url = f"http://127.0.0.1:{self.puerto}"
+        self.url_ws = f"ws://127.0.0.1:{self.puerto}/_stcore/stream"
+        self._comando = [
+            sys.executable, "-m", "streamlit", "run", str(RAIZ / script),
+            "--server.headless", "true", "--server.port", str(self.puerto),
+            "--server.address", "127.0.0.1", "--browser.gatherUsageStats", "false",
+        ]
+        self._entorno = {**os.environ, **(entorno or {})}
+        self._espera = espera
+        self.proceso = None
+
+    def __enter__(self):
+        self.proceso = subprocess.Popen(self._comando, cwd=RAIZ, env=self._entorno,
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        limite = time.monotonic() + self._espera
+        while time.monotonic() < limite:
+            if self.proceso.poll() is not None:
+                raise RuntimeError(f"streamlit terminó al arrancar (código {self.proceso.returncode})")
+            try:
+                with urllib.request.urlopen(f"{self.url}/_stcore/health", timeout=1) as respuesta:
+                    if respuesta.status == 200:
+                        return self
+            except OSError:
+                time.sleep(0.2)
+        self.__exit__()
+        raise TimeoutError("streamlit no respondió al chequeo de salud")
+
+    def __exit__(self, *exc):
+        self.proceso.terminate()
+        try:
+            self.proceso.wait(10)
+        except subprocess.TimeoutExpired:
+            self.proceso.kill()
+
+    def memoria(self):
+        """Memoria residente del servidor, en bytes."""
+        with open(f"/proc/{self.proceso.pid}/status") as f:
+            for linea in f:
+                if linea.startswith("VmRSS:"):
+                    return int(linea.split()[1]) * 1024
+        return 0
+
+    def cpu(self):
+        """Segundos de CPU (usuario + sistema) consumidos por el servidor."""
+        with open(f"/proc/{self.proceso.pid}/stat") as f:
+            campos = f.read().rsplit(")", 1)[1].split()
+        return (int(campos[11]) + int(campos[12])) / _TICKS
+
+
+class Sesion:
+    """Una pestaña del navegador conectada al servidor."""
+
+    def __init__(self, url_ws):
+        self.url_ws = url_ws
+        self.widgets = {}    # etiqueta -> widget (protobuf), del último rerun
+        self.fragmentos = {}  # etiqueta de un widget -> id del fragmento que lo contiene
+        self.paginas = {}    # título de la página -> hash de su script
+        self.pestanas = {}   # etiqueta de una pestaña -> id de su st.tabs
+        self.errores = []
+        self._estados = {}   # id del widget -> WidgetState
+        self._contenedor = None
+        self._pagina = None  # hash del script de la página a pedir en el próximo rerun
+        self._ws = None
+
+    async def conectar(self):
+        self._ws = await websockets.connect(self.url_ws, subprotocols=["streamlit"],
+                                            max_size=None, compression=None)
+
+    async def cerrar(self):
+        await self._ws.close()
+
+    async def correr(self, fragmento=None, timeout=120):
+        """Pide un rerun (del script o de un fragmento) y espera a que termine; devuelve los segundos."""
+        mensaje = BackMsg()
+        estado = mensaje.rerun_script
+        estado.widget_states.widgets.extend(self._estados.values())
+        if self._pagina:
+            estado.page_script_hash = self._pagina
+        if fragmento:
+            estado.fragment_id = fragmento
+        inicio = time.perf_counter()
+        await self._ws.send(mensaje.SerializeToString())
+        while True:
+            datos = await asyncio.wait_for(self._ws.recv(), timeout)
+            respuesta = ForwardMsg()
+            respuesta.ParseFromString(datos)
+            tipo = respuesta.WhichOneof("type")
+            if tipo == "delta":
+                self._registrar(respuesta)
+            elif tipo == "navigation":
+                self.paginas = {p.page_name: p.page_script_hash for p in respuesta.navigation.app_pages}
+            elif tipo == "script_finished":
+                if respuesta.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    return time.perf_counter() - inicio
+
+    def _registrar(self, mensaje):
+        delta = mensaje.delta
+        if delta.WhichOneof("type") == "add_block":
+            self._registrar_bloque(delta)
+            return
+        if delta.WhichOneof("type") != "new_element":
+            return
+        elemento = delta.new_element
+        tipo = elemento.WhichOneof("type")
+        if tipo == "exception":
+            self.errores.append(elemento.exception.message)
+            return
+        widget = getattr(elemento, tipo)
+        if hasattr(widget, "id") and hasattr(widget, "label") and widget.id:
+            self.widgets[widget.label] = widget
+            if delta.fragment_id:
+                self.fragmentos[widget.label] = delta.fragment_id
+
+    def _registrar_bloque(self, delta):
+        # Las pestañas llegan después de su st.tabs, como bloques hijos
+        bloque = delta.add_block
+        tipo = bloque.WhichOneof("type")
+        if tipo == "tab_container":
+            self._contenedor = bloque.tab_container.id
+        elif tipo == "tab":
+            self.pestanas[bloque.tab.label] = self._contenedor
+            if delta.fragment_id:
+                self.fragmentos[bloque.tab.label] = delta.fragment_id
+
+    def _estado(self, etiqueta):
+        widget_id = self.pestanas.get(etiqueta) or self.widgets[etiqueta].id
+        return self._estados.setdefault(widget_id, WidgetState(id=widget_id))
+
+    def ir(self, pagina):
+        """Cambia de página (por su título) en el próximo rerun, como un enlace de la barra lateral."""
+        self._pagina = self.paginas[pagina]
+
+    def elegir(self, etiqueta, opcion):
+        """Fija la opción de un selectbox, como lo haría el usuario."""
+        self._estado(etiqueta).string_value = opcion
+
+    def activar(self, etiqueta, valor=True):
+        """Fija el valor de un toggle o checkbox."""
+        self._estado(etiqueta).bool_value = valor
+
+    def abrir_pestana(self, etiqueta):
+        """Abre una pestaña de un ``st.tabs`` con estado (``key=...``)."""
+        self._estado(etiqueta).string_value = etiqueta
@@ -0,0 +1,207 @@
+"""Búsqueda de texto completo en los textos de todas las semanas publicadas.
+
+Los textos de análisis de cada semana (la tabla ``textos``) y el detalle por
+país (``overview`` y ``key_areas`` de ``paises_detalle``) se indexan párrafo
+por párrafo en una tabla FTS5 de SQLite, sin distinguir tildes ni mayúsculas.
+Las consultas se ordenan por relevancia (BM25) y devuelven un fragmento con
+los términos resaltados; sobre años de reportes responden en milisegundos.
+
+El índice se actualiza por semana: cada una guarda una huella de sus tablas de
+texto (tamaño y fecha de modificación), y sólo se reindexan las semanas nuevas
+o republicadas; las que salieron del almacén se borran. La aplicación lo
+pone al día sola cuando cambia ``indice.json``.
+
+En la consulta, las frases entre comillas se buscan juntas ("Vaca Muerta"),
+las demás palabras deben aparecer todas, y un ``*`` final busca por prefijo
+(``arancel*``). "T-MEC" se busca como la frase "t mec".
+
+Uso:
+    python busqueda.py actualizar
+    python busqueda.py buscar "Vaca Muerta" [--semana 2025-03-01] [--limite 10]
+"""
+import argparse
+import re
+import sqlite3
+import threading
+from collections import namedtuple
+
+import almacen
+
+RUTA = almacen.RAIZ / "textos.sqlite"
+TABLAS_TEXTO = ('textos', 'paises_detalle')
+
+# Clave de la tabla ``textos`` -> sección del reporte donde aparece
+SECCIONES = {
+    'resumen_ejecutivo': "Resumen Ejecutivo",
+    'hallazgos_temas': "1. Principales Temas",
+    'analisis_temas': "1. Principales Temas",
+    'comercio': "2. Detalle de Implicancias",
+    'inversion': "2. Detalle de Implicancias",
+    'migracion_hallazgos': "2. Detalle de Implicancias",
+    'migracion_perspectivas': "2. Detalle de Implicancias",
+    'seguridad': "2. Detalle de Implicancias",
+    'recomendaciones': "3. Detalle por Países",
+    'proximos_indicadores': "4. Áreas Críticas",
+    'implicaciones_areas': "4. Áreas Críticas",
+}
+SECCION_PAISES = "3. Detalle por Países"
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS semanas (id TEXT PRIMARY KEY, huella TEXT);
+CREATE VIRTUAL TABLE IF NOT EXISTS pasajes USING fts5(
+    texto, pais, semana UNINDEXED, periodo UNINDEXED, seccion UNINDEXED, clave UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+Resultado = namedtuple('Resultado', 'semana periodo seccion pais clave fragmento puntaje')
+
+
+def consulta_fts(texto):
+    """Consulta FTS5 a partir de lo que escribe el usuario, sin operadores sueltos que la rompan."""
+    terminos = []
+    for frase, palabra in re.findall(r'"([^"]*)"|(\S+)', texto):
+        termino = (frase or palabra).replace('"', '')
+        prefijo = not frase and termino.endswith('*')
+        termino = termino.rstrip('*').strip()
+        if termino:
+            terminos.append(f'"{termino}"' + ('*' if prefijo else ''))
+    return ' '.join(terminos)
+
+
+def _parrafos(texto):
+    return [parrafo.strip() for parrafo in re.split(r'\n\s*\n', texto or '') if parrafo.strip()]
+
+
+def _huella(semana_id):
+    partes = []
+    for tabla in TABLAS_TEXTO:
+        try:
+            estado = (almacen.RAIZ / semana_id / f"{tabla}.arrow").stat()
+            partes.append(f"{tabla}:{estado.st_mtime_ns}:{estado.st_size}")
+        except FileNotFoundError:
+            partes.append(f"{tabla}:-")
+    return ' '.join(partes)
+
+
+def pasajes_semana(semana):
+    """Filas ``(texto, pais, seccion, clave)`` de los textos de una semana del almacén."""
+    filas = []
+    textos = almacen.abrir_tabla(semana['id'], 'textos')
+    for clave, texto in zip(textos['clave'].to_pylist(), textos['texto'].to_pylist()):
+        filas += [(parrafo, None, SECCIONES.get(clave, clave), clave) for parrafo in _parrafos(texto)]
+    detalle = almacen.abrir_tabla(semana['id'], 'paises_detalle')
+    for pais, overview, areas in zip(detalle['País'].to_pylist(), detalle['overview'].to_pylist(),
+                                     detalle['key_areas'].to_pylist()):
+        filas += [(parrafo, pais, SECCION_PAISES, 'overview') for parrafo in _parrafos(overview)]
+        if areas:
+            filas.append(('\n'.join(areas), pais, SECCION_PAISES, 'key_areas'))
+    return filas
+
+
+class IndiceTextos:
+    """Índice FTS5 de los textos del almacén; se puede compartir entre hilos."""
+
+    def __init__(self, ruta=RUTA):
+        self._conexion = sqlite3.connect(str(ruta), check_same_thread=False)
+        self._conexion.executescript(ESQUEMA)
+        self._candado = threading.Lock()
+        self._indice_visto = None
+
+    def close(self):
+        self._conexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def actualizar(self):
+        """Reindexa las semanas nuevas o republicadas y quita las borradas; devuelve ``(actualizadas, borradas)``."""
+        with self._candado, self._conexion:
+            guardadas = dict(self._conexion.execute("SELECT id, huella FROM semanas"))
+            actualizadas = 0
+            for semana in almacen.leer_indice():
+                huella = _huella(semana['id'])
+                if guardadas.pop(semana['id'], None) == huella:
+                    continue
+                self._conexion.execute("DELETE FROM pasajes WHERE semana = ?", (semana['id'],))
+                self._conexion.executemany(
+                    "INSERT INTO pasajes (texto, pais, semana, periodo, seccion, clave) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(texto, pais, semana['id'], semana['periodo'], seccion, clave)
+                     for texto, pais, seccion, clave in pasajes_semana(semana)])
+                self._conexion.execute("INSERT OR REPLACE INTO semanas VALUES (?, ?)", (semana['id'], huella))
+                actualizadas += 1
+            for semana_id in guardadas:
+                self._conexion.execute("DELETE FROM pasajes WHERE semana = ?", (semana_id,))
+                self._conexion.execute("DELETE FROM semanas WHERE id = ?", (semana_id,))
+        return actualizadas, len(guardadas)
+
+    def al_dia(self):
+        """Actualiza el índice sólo si ``indice.json`` cambió desde la última vez."""
+        visto = (almacen.RAIZ / almacen.INDICE).stat().st_mtime_ns
+        if visto != self._indice_visto:
+            self.actualizar()
+            self._indice_visto = visto
+
+    def buscar(self, texto, limite=20, semana=None):
+        """Pasajes que coinciden con ``texto``, del más al menos relevante."""
+        consulta = consulta_fts(texto)
+        if not consulta:
+            return []
+        sql = ("SELECT semana, periodo, seccion, pais, clave, "
+               "snippet(pasajes, 0, '<mark>', '</mark>', '…', 24), bm25(pasajes) "
+               "FROM pasajes WHERE pasajes MATCH ?")
+        parametros = [consulta]
+        if semana is not None:
+            sql += " AND semana = ?"
+            parametros.append(semana)
+        sql += " ORDER BY bm25(pasajes) LIMIT ?"
+        parametros.append(limite)
+        with self._candado:
+            return [Resultado(*fila) for fila in self._conexion.execute(sql, parametros)]
+
+
+def abrir_indice(ruta=RUTA):
+    """Índice listo para consultar, puesto al día con el almacén."""
+    indice = IndiceTextos(ruta)
+    indice.al_dia()
+    return indice
+
+
+def _actualizar(args, indice):
+    actualizadas, borradas = indice.actualizar()
+    print(f"{actualizadas} semanas indexadas, {borradas} quitadas del índice")
+
+
+def _buscar(args, indice):
+    import time
+
+    indice.al_dia()
+    inicio = time.perf_counter()
+    resultados = indice.buscar(args.consulta, args.limite, args.semana)
+    print(f"{len(resultados)} resultados en {(time.perf_counter() - inicio) * 1000:.1f} ms\n")
+    for r in resultados:
+        fragmento = r.fragmento.replace('<mark>', '[').replace('</mark>', ']').replace('\n', ' ')
+        print(f"{r.semana}  {r.seccion}{' · ' + r.pais if r.pais else ''}  ({r.puntaje:.2f})\n    {fragmento}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Búsqueda de texto completo en el archivo de reportes.")
+    parser.add_argument("--indice", default=RUTA, help="Archivo SQLite del índice.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    actualizar = sub.add_parser("actualizar", help="Indexa las semanas nuevas o republicadas.")
+    actualizar.set_defaults(func=_actualizar)
+    buscar = sub.add_parser("buscar", help="Busca en los textos de todas las semanas.")
+    buscar.add_argument("consulta")
+    buscar.add_argument("--semana", help="Sólo en esta semana.")
+    buscar.add_argument("--limite", type=int, default=10)
+    buscar.set_defaults(func=_buscar)
+    args = parser.parse_args()
+    with IndiceTextos(args.indice) as indice:
+        args.func(args, indice)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Capa de memoización de datos y figuras del reporte.
+
+Los objetos se guardan con ``st.cache_resource``: viven una vez por proceso y se
+comparten entre reruns y sesiones sin copiarse (``st.cache_data`` serializaría
+cada figura en cada acceso). La clave combina el período del reporte, el nombre
+del constructor y una huella del contenido de sus entradas, de modo que un
+rerun sólo reconstruye lo que cambió. Al publicarse una semana nueva se vacía
+la caché completa.
+
+Las figuras (``construir_figura``) se guardan además en disco como el JSON que
+se envía al navegador, con la misma huella de contenido más una del código del
+módulo del constructor y de los módulos del repositorio que éste usa (``geo``
+para los mapas, por ejemplo), así que cambiar un ayudante también invalida las
+figuras guardadas. Un proceso recién arrancado, o una réplica nueva, las levanta de
+ahí en lugar de volver a ejecutar ``px.bar``/``px.scatter``; el JSON se
+serializa y se lee con ``orjson`` cuando está instalado.
+"""
+import hashlib
+import inspect
+import json
+import os
+import sys
+import tempfile
+import threading
+import types
+from functools import lru_cache
+from pathlib import Path
+
+import streamlit as st
+
+import metricas
+from perfil import diferido
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+go = diferido('plotly.graph_objects')
+pio = diferido('plotly.io')
+
+RAIZ = Path(__file__).resolve().parent
+RUTA_FIGURAS = Path(os.environ.get("MONITOR_CACHE_FIGURAS", Path(__file__).resolve().parent / ".cache" / "figuras"))
+MAX_FIGURAS_DISCO = 512  # se borran las más viejas al superarlo
+
+_candado = threading.Lock()
+_periodo_vigente = None
+
+
+def huella(*objetos):
+    """Hash de contenido estable para DataFrames y estructuras JSON simples."""
+    # pandas se consulta sólo si ya está cargado: si no lo está, ningún
+    # argumento puede ser un DataFrame y no hace falta importarlo
+    pd = sys.modules.get('pandas')
+    h = hashlib.blake2b(digest_size=16)
+    for obj in objetos:
+        if pd is not None and isinstance(obj, pd.DataFrame):
+            h.update(json.dumps(list(map(str, obj.columns))).encode())
+            h.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+        else:
+            h.update(json.dumps(obj, sort_keys=True, default=str).encode())
+        h.update(b'\x00')
+    return h.hexdigest()
+
+
+@st.cache_resource(max_entries=256, show_spinner=False)
+def _construir(nombre, periodo, clave, _constructor, _args):
+    # Sólo `nombre`, `periodo` y `clave` forman la clave de caché; los
+    # argumentos con guion bajo no son hasheados por Streamlit.
+    return _constructor(*_args)
+
+
+def construir(periodo, constructor, *args):
+    """Devuelve ``constructor(*args)`` memoizado por período y contenido."""
+    nombre = f"{constructor.__module__}.{constructor.__qualname__}"
+    with metricas.medir("construccion", constructor.__name__):
+        return _construir(nombre, periodo, huella(*args), constructor, args)
+
+
+def _modulos_locales(modulo):
+    """``modulo`` y los módulos del repositorio que usa, directa o indirectamente, por nombre."""
+    vistos, pendientes = {}, [modulo]
+    while pendientes:
+        actual = pendientes.pop()
+        if actual.__name__ in vistos:
+            continue
+        vistos[actual.__name__] = actual
+        for valor in vars(actual).values():
+            # Módulos importados y funciones o clases importadas con ``from``;
+            # los ``diferido`` son siempre de bibliotecas y no se cuentan
+            if inspect.isfunction(valor) or inspect.isclass(valor):
+                valor = inspect.getmodule(valor)
+            ruta = getattr(valor, '__file__', None) if isinstance(valor, types.ModuleType) else None
+            if ruta and Path(ruta).resolve().is_relative_to(RAIZ):
+                pendientes.append(valor)
+    return dict(sorted(vistos.items()))
+
+
+@lru_cache(maxsize=None)
+def _version(constructor):
+    # Un cambio en el módulo del constructor, en los módulos del repositorio
+    # de los que depende (o en plotly) invalida sus figuras en disco
+    import plotly
+
+    fuentes = [inspect.getsource(m) for m in _modulos_locales(inspect.getmodule(constructor)).values()]
+    return huella(*fuentes, plotly.__version__)
+
+
+def _figura_persistida(constructor, args):
+    ruta = RUTA_FIGURAS / f"{constructor.__name__}-{huella(_version(constructor), *args)}.json"
+    try:
+        spec = _leer_json(ruta.read_bytes())
+    except (OSError, ValueError):
+        payload = pio.to_json(constructor(*args), validate=False, engine="orjson" if orjson else "json")
+        _guardar(ruta, payload)
+        spec = _leer_json(payload)
+    # El JSON ya salió de una figura válida: se reconstruye sin validar cada
+    # propiedad, que es lo que cuesta construirla
+    return go.Figure(spec, _validate=False)
+
+
+def _leer_json(datos):
+    return orjson.loads(datos) if orjson else json.loads(datos)
+
+
+def _guardar(ruta, payload):
+    try:
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(prefix=".", suffix=".json", dir=ruta.parent)
+        with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(temporal, ruta)
+        _podar(ruta.parent)
+    except OSError:
+        # Sin disco escribible la figura sigue sirviéndose desde memoria
+        pass
+
+
+def _podar(directorio):
+    # Figuras con datos que cambian seguido (indicadores refrescados) dejan
+    # versiones viejas que nadie va a volver a pedir
+    with os.scandir(directorio) as entradas:
+        archivos = [(e.stat().st_mtime, e.path) for e in entradas
+                    if e.name.endswith(".json") and not e.name.startswith(".")]
+    for _, ruta in sorted(archivos)[:-MAX_FIGURAS_DISCO]:
+        try:
+            os.unlink(ruta)
+        except FileNotFoundError:
+            pass
+
+
+def construir_figura(periodo, constructor, *args):
+    """Como ``construir``, para figuras Plotly persistidas en ``RUTA_FIGURAS``."""
+    nombre = f"{constructor.__module__}.{constructor.__qualname__}"
+    with metricas.medir("construccion", constructor.__name__):
+        return _construir(nombre, periodo, huella(*args), _figura_persistida, (constructor, args))
+
+
+def sincronizar_periodo(periodo):
+    """Vacía la caché si el período publicado cambió desde la última corrida."""
+    global _periodo_vigente
+    with _candado:
+        if periodo != _periodo_vigente:
+            if _periodo_vigente is not None:
+                _construir.clear()
+            _periodo_vigente = periodo
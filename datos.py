@@ -0,0 +1,100 @@
+"""Datos del reporte semanal EEUU-LATAM.
+
+Los datasets de cada semana viven en el almacén columnar (ver ``almacen.py``).
+``cargar_datos`` devuelve una vista perezosa de una semana: cada tabla se abre
+recién cuando una sección la pide, y se convierte una sola vez. La vista se
+memoiza con ``cache.py`` y la comparten todas las sesiones, así que su
+contenido es de sólo lectura: las columnas numéricas de los DataFrames son
+vistas sobre el archivo Arrow mapeado en memoria (sin copia, y compartidas
+además entre procesos por la caché de páginas del sistema), y los textos y el
+detalle por país son mapeos inmutables. Cada sesión guarda únicamente el
+estado de sus widgets.
+"""
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
+
+import almacen
+from impacto import MatrizImpacto
+
+# Nombre en el reporte -> tabla del almacén
+TABLAS = {
+    'temas_data': 'temas',
+    'comercio_df': 'comercio',
+    'inversion_df': 'inversion',
+    'migracion_data': 'migracion',
+    'seguridad_data': 'seguridad',
+    'paises_data': 'paises',
+    'areas_criticas': 'areas_criticas',
+}
+
+
+class DatosSemana(Mapping):
+    """Datasets de una semana, cargados bajo demanda desde el almacén."""
+
+    def __init__(self, semana_id, version=None):
+        self.semana_id = semana_id
+        self.version = version  # ``version`` de la semana en el índice del almacén
+        self._cargados = {}
+        # Reentrante: algunas tablas se construyen a partir de otras (paises_data usa impacto)
+        self._candado = threading.RLock()
+
+    def __getitem__(self, nombre):
+        if nombre not in self._cargados:
+            with self._candado:
+                if nombre not in self._cargados:
+                    self._cargados[nombre] = self._cargar(nombre)
+        return self._cargados[nombre]
+
+    def __iter__(self):
+        return iter([*TABLAS, 'country_data', 'impacto', 'textos'])
+
+    def __len__(self):
+        return len(TABLAS) + 3
+
+    def __repr__(self):
+        # También es su huella en ``cache.construir``: una semana publicada,
+        # una vista; al republicarla cambia la versión y con ella la clave
+        if self.version is None:
+            return f"DatosSemana({self.semana_id!r})"
+        return f"DatosSemana({self.semana_id!r}, version={self.version!r})"
+
+    def _tabla(self, nombre):
+        # Un bloque por columna: las numéricas quedan como vistas de sólo
+        # lectura sobre el mmap en lugar de consolidarse en una copia
+        return almacen.abrir_tabla(self.semana_id, nombre).to_pandas(split_blocks=True)
+
+    def _cargar(self, nombre):
+        if nombre == 'country_data':
+            return self._country_data()
+        if nombre == 'impacto':
+            return MatrizImpacto.desde_tabla(self._tabla('impacto_paises'))
+        if nombre == 'paises_data':
+            # El impacto de la tabla es el puntaje compuesto de la matriz
+            return self['impacto'].con_impacto(self._tabla('paises'))
+        if nombre == 'textos':
+            # Textos de análisis de la semana (markdown), por clave
+            # (sin pasar por pandas: el encabezado los usa antes que ninguna tabla)
+            textos = almacen.abrir_tabla(self.semana_id, 'textos')
+            return MappingProxyType(dict(zip(textos['clave'].to_pylist(), textos['texto'].to_pylist())))
+        return self._tabla(TABLAS[nombre])
+
+    def _country_data(self):
+        # Textos por país de la sección 3; el impacto está en ``impacto``
+        detalle = self._tabla('paises_detalle')
+        return MappingProxyType({
+            fila['País']: MappingProxyType({
+                'overview': fila['overview'],
+                'key_areas': tuple(fila['key_areas'])
+            })
+            for _, fila in detalle.iterrows()
+        })
+
+
+def cargar_datos(semana_id, version=None):
+    """Vista perezosa de los datasets de la semana ``semana_id``.
+
+    ``version`` es la de la semana en el índice; sólo distingue la vista de
+    una semana republicada de la anterior en la caché.
+    """
+    return DatosSemana(semana_id, version)
@@ -0,0 +1,88 @@
+"""Documentos detrás de las ``Menciones`` del reporte, consultados en el servidor.
+
+Cada ``Menciones`` de la tabla de países resume una fila del índice
+(``indexador.py``) por documento que nombra al país, y pueden ser decenas de
+miles. Esas filas se cargan una vez por semana como tabla Arrow, compartida
+por todas las sesiones con ``cache.construir``; el filtrado, el orden y los
+agregados se calculan sobre ella con ``pyarrow.compute`` y al navegador sólo
+viaja la página visible.
+"""
+import math
+
+import pyarrow.compute as pc
+
+import indexador
+
+FILAS_POR_PAGINA = 25
+
+# Orden de la tabla -> claves de pyarrow. Cada documento aparece una vez por
+# término, así que ``documento`` desempata y las páginas no se solapan
+ORDENES = {
+    "Más menciones": [('conteo', 'descending'), ('fecha', 'descending'), ('documento', 'ascending')],
+    "Más recientes": [('fecha', 'descending'), ('conteo', 'descending'), ('documento', 'ascending')],
+    "Documento": [('documento', 'ascending')],
+}
+COLUMNAS = {'fecha': 'Fecha', 'documento': 'Documento', 'conteo': 'Menciones'}
+
+
+def version_indice(ruta=indexador.RUTA):
+    """Marca de la última escritura del índice, o ``None`` si todavía no existe."""
+    try:
+        return ruta.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def cargar_menciones(semana_id, version, ruta=indexador.RUTA):
+    """Menciones por documento de la semana; ``version`` sólo forma parte de la clave de caché."""
+    with indexador.IndiceMenciones(ruta) as indice:
+        return indice.tabla_semana(semana_id)
+
+
+class Consulta:
+    """Menciones de un término en ``tabla``, opcionalmente sólo de documentos cuya ruta contiene ``texto``."""
+
+    def __init__(self, tabla, tipo, nombre, texto=""):
+        mascara = pc.and_(pc.equal(tabla['tipo'], tipo), pc.equal(tabla['nombre'], nombre))
+        if texto:
+            mascara = pc.and_(mascara, pc.match_substring(tabla['documento'], texto, ignore_case=True))
+        self.tabla = tabla
+        self.filas = tabla.filter(mascara)
+
+    def __len__(self):
+        return self.filas.num_rows
+
+    def paginas(self, tamano=FILAS_POR_PAGINA):
+        return max(1, math.ceil(len(self) / tamano))
+
+    @property
+    def menciones(self):
+        return pc.sum(self.filas['conteo']).as_py() or 0
+
+    def por_dia(self):
+        """Documentos y menciones por fecha."""
+        agregado = self.filas.group_by('fecha').aggregate([('documento', 'count'), ('conteo', 'sum')])
+        return (agregado.sort_by('fecha').to_pandas()
+                .rename(columns={'fecha': 'Fecha', 'documento_count': 'Documentos', 'conteo_sum': 'Menciones'}))
+
+    def relacionados(self, tipo='tema'):
+        """Términos de ``tipo`` mencionados en los mismos documentos, de más a menos menciones."""
+        en_documentos = pc.is_in(self.tabla['documento'], value_set=self.filas['documento'].combine_chunks())
+        otras = self.tabla.filter(pc.and_(pc.equal(self.tabla['tipo'], tipo), en_documentos))
+        agregado = otras.group_by('nombre').aggregate([('documento', 'count'), ('conteo', 'sum')])
+        agregado = agregado.sort_by([('conteo_sum', 'descending')])
+        return (agregado.to_pandas()
+                .rename(columns={'nombre': 'Término', 'documento_count': 'Documentos', 'conteo_sum': 'Menciones'}))
+
+    def pagina(self, numero, orden="Más menciones", tamano=FILAS_POR_PAGINA):
+        """Filas de la página ``numero`` (desde 1) según ``orden``, como DataFrame.
+
+        Sólo se ordenan las filas hasta el final de la página pedida
+        (``select_k_unstable``), no la consulta completa.
+        """
+        inicio, fin = (numero - 1) * tamano, min(numero * tamano, len(self))
+        columnas = list(COLUMNAS)
+        if inicio >= fin:
+            return self.filas.select(columnas).slice(0, 0).to_pandas().rename(columns=COLUMNAS)
+        indices = pc.select_k_unstable(self.filas, k=fin, sort_keys=ORDENES[orden])
+        return self.filas.take(indices[inicio:]).select(columnas).to_pandas().rename(columns=COLUMNAS)
@@ -0,0 +1,204 @@
+"""Exporta el reporte de una semana a un único archivo HTML autocontenido.
+
+El archivo incluye el encabezado, el resumen ejecutivo, las cuatro secciones,
+cada figura Plotly con su JSON embebido y la tabla de países estilizada, de
+modo que puede servirse como estático (nginx, carpeta compartida) sin un
+proceso de Python por lector. El detalle por país usa el radar con selector de
+Plotly, que funciona sin servidor.
+
+Con ``--plotlyjs svg`` las figuras van como imágenes SVG (requiere kaleido) y
+el documento no usa JavaScript: es la base de la salida en PDF de
+``generar.py``, que también exporta variantes por subregión o país (ver
+``plantilla.py``).
+
+Uso:
+    python exportar.py [--semana 2025-03-01] [--subregion "Cono Sur" | --pais México]
+                       [--salida reporte.html] [--plotlyjs cdn]
+"""
+import argparse
+import html
+from pathlib import Path
+
+import markdown
+import plotly
+import plotly.offline
+
+import almacen
+import figuras
+import geo
+import plantilla
+import recursos
+from datos import cargar_datos
+
+# Reglas de maquetación propias del documento estático; el resto del estilo es
+# el mismo ``estilo.css`` de la aplicación.
+ESTILO_ESTATICO = """
+body { max-width: 1200px; margin: 0 auto; padding: 2rem; }
+nav { margin-bottom: 2rem; }
+nav a { margin-right: 1.5rem; color: #0078D4; text-decoration: none; }
+.fila { display: grid; gap: 2rem; align-items: start; }
+.fila-2-1 { grid-template-columns: 2fr 1fr; }
+.fila-3-2 { grid-template-columns: 3fr 2fr; }
+.fila-3-1 { grid-template-columns: 3fr 1fr; }
+.fila-1-1 { grid-template-columns: 1fr 1fr; }
+.fila-1-1-1 { grid-template-columns: 1fr 1fr 1fr; }
+table { border-collapse: collapse; width: 100%; }
+th, td { padding: 0.4rem 0.8rem; border-bottom: 1px solid #EEEEEE; }
+details { margin: 0.5rem 0; }
+summary { cursor: pointer; font-weight: 600; }
+@media print { .fila { display: block; } svg { max-width: 100%; height: auto; } }
+"""
+
+SECCIONES = [
+    ("resumen-ejecutivo", "Resumen Ejecutivo"),
+    ("1-principales-temas", "1. Principales Temas"),
+    ("2-detalle-de-implicancias", "2. Detalle de Implicancias"),
+    ("3-detalle-por-países", "3. Detalle por Países"),
+    ("4-áreas-críticas", "4. Áreas Críticas"),
+]
+
+
+def _md(texto):
+    return markdown.markdown(texto)
+
+
+def _figura(fig):
+    return fig.to_html(full_html=False, include_plotlyjs=False, config={"displaylogo": False})
+
+
+def _figura_svg(fig):
+    return fig.to_image(format="svg", width=900).decode("utf-8")
+
+
+def _fila(proporcion, *columnas):
+    celdas = "".join(f"<div>{c}</div>" for c in columnas)
+    return f'<div class="fila fila-{proporcion}">{celdas}</div>'
+
+
+def _plotlyjs(modo):
+    if modo == "svg":
+        return ""
+    if modo == "cdn":
+        return f'<script src="https://cdn.plot.ly/plotly-{plotly.__version__}.min.js"></script>'
+    return f"<script>{plotly.offline.get_plotlyjs()}</script>"
+
+
+def renderizar_html(semana, datos, plotlyjs="inline", variante=None):
+    """HTML completo del reporte de ``semana`` a partir de sus ``datos``.
+
+    Con una ``variante`` de ``plantilla.py``, el título y los datos por país
+    corresponden a su recorte.
+    """
+    variante = variante or plantilla.Variante(semana['id'])
+    datos = plantilla.recortar(datos, variante.paises)
+    figura = _figura_svg if plotlyjs == "svg" else _figura
+    textos = datos['textos']
+    country_data = datos['country_data']
+    impacto = datos['impacto']
+    encabezado = html.escape(variante.titulo)
+    periodo = html.escape(semana['periodo'])
+
+    partes = [
+        f'<img src="{recursos.logo_data_uri()}" width="200" alt="CEPAL Lab">',
+        f"<h1>{encabezado}</h1>",
+        f"<p><strong>{periodo}</strong></p>",
+        "<nav>" + "".join(f'<a href="#{ancla}">{titulo}</a>' for ancla, titulo in SECCIONES) + "</nav>",
+        "<hr>",
+        f'<div class="highlight" id="resumen-ejecutivo"><h3>Resumen Ejecutivo</h3>'
+        f"<p>{textos['resumen_ejecutivo']}</p></div>",
+
+        '<h2 id="1-principales-temas">1. Principales Temas</h2>',
+        _fila("2-1",
+              figura(figuras.figura_temas(datos['temas_data'])),
+              "<h3>Hallazgos clave</h3>" + _md(textos['hallazgos_temas'])),
+        _md(textos['analisis_temas']),
+
+        '<h2 id="2-detalle-de-implicancias">2. Detalle de Implicancias</h2>',
+        "<h3>Impacto Comercial</h3>",
+        _fila("2-1", figura(figuras.figura_comercio(datos['comercio_df'])), _md(textos['comercio'])),
+        "<h3>Tendencias de Inversión</h3>",
+        _fila("3-2", figura(figuras.figura_inversion(datos['inversion_df'])), _md(textos['inversion'])),
+        "<h3>Dinámica Migratoria</h3>",
+        figura(figuras.figura_migracion(datos['migracion_data'])),
+        _fila("1-1", _md(textos['migracion_hallazgos']), _md(textos['migracion_perspectivas'])),
+        "<h3>Cooperación en Seguridad</h3>",
+        _fila("2-1", figura(figuras.figura_seguridad(datos['seguridad_data'])), _md(textos['seguridad'])),
+
+        '<h2 id="3-detalle-por-países">3. Detalle por Países</h2>',
+        "<h3>Impacto por país</h3>",
+        figura(figuras.figura_mapa(impacto.resumen())),
+        "<h3>Países mencionados esta semana</h3>",
+    ]
+    if datos['paises_data'].empty:
+        partes.append("<p>Ningún país de este recorte fue mencionado esta semana.</p>")
+    else:
+        partes.append(figuras.tabla_paises(datos['paises_data']).to_html())
+    radar = ""
+    if country_data and plotlyjs != "svg":
+        radar = figura(figuras.figura_radar_paises(impacto.tabla(country_data)))
+    partes.append(_fila("2-1", radar, "<h3>Recomendaciones</h3>" + _md(textos['recomendaciones'])))
+    for pais, detalle in country_data.items():
+        areas = "".join(f"<li>{html.escape(area)}</li>" for area in detalle['key_areas'])
+        # Sin JavaScript no hay selector en el radar: cada país lleva el suyo, desplegado
+        radar_pais = ""
+        fila = impacto.fila(pais)
+        if plotlyjs == "svg" and fila is not None:
+            radar_pais = figura(figuras.figura_radar(pais, fila.tolist(), list(impacto.dimensiones)))
+        partes.append(
+            f"<details{' open' if plotlyjs == 'svg' else ''}><summary>{html.escape(pais)}</summary>"
+            f"{_md(detalle['overview'])}{radar_pais}"
+            f"<h4>Áreas clave de atención</h4><ul>{areas}</ul></details>"
+        )
+    partes += [
+        '<h2 id="4-áreas-críticas">4. Áreas Críticas para Monitoreo</h2>',
+        _fila("3-1",
+              figura(figuras.figura_areas(datos['areas_criticas'])),
+              "<h3>Próximos indicadores a vigilar</h3>" + _md(textos['proximos_indicadores'])),
+        _md(textos['implicaciones_areas']),
+        "<hr>",
+        _fila("1-1-1",
+              '<p class="small-text">Reporte preparado por CEPAL Lab para el Trade Emergency Team</p>',
+              f'<p class="small-text">Datos actualizados al {html.escape(semana.get("actualizado", semana["periodo"]))}</p>',
+              '<p class="small-text">© Cepal Lab - Versión de prueba - contenido ficticio</p>'),
+    ]
+
+    return f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{encabezado} | CEPAL Lab | {periodo}</title>
+<style>
+{recursos.css_fuentes(embebidas=True)}
+{recursos.ESTILO}
+{ESTILO_ESTATICO}
+</style>
+{_plotlyjs(plotlyjs)}
+</head>
+<body>
+{chr(10).join(partes)}
+</body>
+</html>
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta el reporte semanal a HTML estático.")
+    parser.add_argument("--semana", help="Semana a exportar (por defecto, la más reciente).")
+    alcance = parser.add_mutually_exclusive_group()
+    alcance.add_argument("--subregion", choices=sorted(geo.SUBREGIONES), help="Limita los datos por país a una subregión.")
+    alcance.add_argument("--pais", choices=sorted(geo.ISO3), metavar="PAÍS", help="Reporte de un solo país.")
+    parser.add_argument("--salida", help="Archivo de salida (por defecto, reporte-<semana>[-<recorte>].html).")
+    parser.add_argument("--plotlyjs", choices=["inline", "cdn", "svg"], default="inline",
+                        help="Embeber plotly.js en el archivo (por defecto), cargarlo desde su CDN o "
+                             "dibujar las figuras como SVG sin JavaScript.")
+    args = parser.parse_args()
+
+    semana = almacen.buscar_semana(args.semana) if args.semana else almacen.leer_indice()[0]
+    variante = plantilla.Variante(semana['id'], args.subregion, args.pais)
+    salida = Path(args.salida or f"{variante.nombre}.html")
+    salida.write_text(renderizar_html(semana, cargar_datos(semana['id']), args.plotlyjs, variante), encoding="utf-8")
+    print(f"Reporte de {semana['periodo']} exportado a {salida}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""Constructores de las figuras Plotly y tablas estilizadas del reporte.
+
+Cada función recibe únicamente los datos que grafica y devuelve una figura
+nueva; no llaman a Streamlit, de modo que pueden memoizarse con ``cache.py`` y
+reutilizarse en la exportación estática (``exportar.py``).
+"""
+import geo
+from perfil import diferido
+
+# Se importan al construir la primera figura (ver ``perfil.py``)
+np = diferido('numpy')
+px = diferido('plotly.express')
+go = diferido('plotly.graph_objects')
+
+
+def figura_temas(temas_data):
+    # Gráfico de barras para temas principales
+    fig = px.bar(
+        temas_data,
+        x='Tema',
+        y='Menciones',
+        color='Impacto Potencial',
+        color_continuous_scale='Blues',
+        text='Menciones',
+        height=400
+    )
+    fig.update_layout(
+        title='Principales temas de la semana',
+        xaxis_title='',
+        yaxis_title='Número de menciones',
+        coloraxis_colorbar_title='Índice de<br>Impacto',
+        plot_bgcolor='white',
+        font=dict(family="Source Sans Pro"),
+        margin=dict(t=50, b=0, l=0, r=0)
+    )
+    return fig
+
+
+def figura_comercio(comercio_df):
+    fig = px.bar(
+        comercio_df,
+        x='Categoría',
+        y='Cambio % Esperado',
+        color='Cambio % Esperado',
+        color_continuous_scale=['#D6324A', '#DFDFDF', '#0078D4'],
+        text='Cambio % Esperado',
+        height=350
+    )
+    fig.update_layout(
+        title='Cambio porcentual esperado por categoría comercial',
+        plot_bgcolor='white',
+        yaxis_title='Cambio Esperado (%)',
+        xaxis_title='',
+        coloraxis_showscale=False,
+        margin=dict(t=50, b=0, l=0, r=0)
+    )
+    fig.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
+    return fig
+
+
+def figura_inversion(inversion_df):
+    fig = px.scatter(
+        inversion_df,
+        x='Sector',
+        y='Crecimiento Anual (%)',
+        size='Inversión (MM USD)',
+        color='Crecimiento Anual (%)',
+        color_continuous_scale='Blues',
+        size_max=50,
+        height=400
+    )
+    fig.update_layout(
+        title='Inversión por sector y tasa de crecimiento',
+        plot_bgcolor='white',
+        yaxis_title='Crecimiento Anual (%)',
+        xaxis_title='',
+        margin=dict(t=50, b=0, l=0, r=0)
+    )
+    return fig
+
+
+def figura_migracion(migracion_data):
+    fig = px.scatter(
+        migracion_data,
+        x='País',
+        y='Remesas (MM USD)',
+        size='Impacto Migratorio',
+        color='Impacto Migratorio',
+        color_continuous_scale='Blues',
+        size_max=50,
+        height=400
+    )
+    fig.update_layout(
+        title='Relación entre remesas e impacto de políticas migratorias',
+        plot_bgcolor='white',
+        yaxis_title='Remesas (Millones USD)',
+        xaxis_title='',
+        coloraxis_colorbar_title='Índice de<br>Impacto',
+        margin=dict(t=50, b=0, l=0, r=0)
+    )
+    return fig
+
+
+def figura_seguridad(seguridad_data):
+    fig = px.bar(
+        seguridad_data,
+        x='Área',
+        y='Financiamiento US (MM USD)',
+        color='Índice de Cooperación',
+        color_continuous_scale='Blues',
+        text='Financiamiento US (MM USD)',
+        height=400
+    )
+    fig.update_layout(
+        title='Financiamiento e índice de cooperación por área de seguridad',
+        plot_bgcolor='white',
+        yaxis_title='Financiamiento (Millones USD)',
+        xaxis_title='',
+        coloraxis_colorbar_title='Índice de<br>Cooperación',
+        margin=dict(t=50, b=0, l=0, r=0)
+    )
+    fig.update_traces(texttemplate='$%{text}M', textposition='outside')
+    return fig
+
+
+def figura_mapa(paises_data):
+    # Mapa de calor de impacto por país: se copia el mapa base y sólo se
+    # asignan los códigos ISO-3 y los valores
+    fig = go.Figure(geo.mapa_base())
+    fig.update_traces(
+        locations=geo.codigos_iso3(paises_data['País']),
+        z=paises_data['Impacto'],
+        customdata=paises_data['País']
+    )
+    return fig
+
+
+def colores_gradiente(valores, escala=None):
+    """Estilos CSS de fondo y texto para un gradiente sobre ``valores``.
+
+    Equivale a ``Styler.background_gradient`` (misma escala ColorBrewer y
+    mismo umbral de contraste para el texto) pero interpola con NumPy sobre
+    toda la columna a la vez, sin depender de matplotlib.
+    """
+    escala = escala or px.colors.sequential.Blues
+    rgb = np.array([px.colors.unlabel_rgb(c) for c in escala], dtype=float)
+    valores = np.asarray(valores, dtype=float)
+    rango = np.ptp(valores)
+    norma = (valores - valores.min()) / rango if rango else np.zeros_like(valores)
+
+    posicion = norma * (len(rgb) - 1)
+    i = np.minimum(posicion.astype(int), len(rgb) - 2)
+    fraccion = (posicion - i)[:, None]
+    fondo = rgb[i] * (1 - fraccion) + rgb[i + 1] * fraccion
+
+    # Luminancia relativa (WCAG) para elegir texto claro u oscuro
+    lineal = fondo / 255
+    lineal = np.where(lineal <= 0.03928, lineal / 12.92, ((lineal + 0.055) / 1.055) ** 2.4)
+    luminancia = lineal @ np.array([0.2126, 0.7152, 0.0722])
+    texto = np.where(luminancia < 0.408, '#f1f1f1', '#000000')
+
+    fondo = np.rint(fondo).astype(int)
+    return [
+        f"background-color: #{r:02x}{g:02x}{b:02x}; color: {t};"
+        for (r, g, b), t in zip(fondo, texto)
+    ]
+
+
+def colores_impacto(paises_data):
+    # Colores del gradiente de la columna de impacto; es lo que se memoiza con
+    # ``cache.py`` (una tupla, inmutable, que pueden compartir las sesiones)
+    return tuple(colores_gradiente(paises_data['Impacto']))
+
+
+def tabla_paises(paises_data, colores=None):
+    # Tabla de países con gradiente en la columna de impacto. El Styler se
+    # arma en cada render: Streamlit lo recalcula al enviarlo y guarda estado
+    # en él, así que no se comparte entre sesiones
+    colores = list(colores if colores is not None else colores_impacto(paises_data))
+    return (
+        paises_data.style.apply(lambda _: colores, subset=['Impacto'])
+        .format({'Impacto': '{:.1f}/10'})
+        .set_properties(**{'text-align': 'left'})
+        .hide(axis='index')
+    )
+
+
+def figura_radar(pais, impacto, categorias):
+    # Crear gráfico de radar para dimensiones de impacto
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatterpolar(
+        r=impacto,
+        theta=categorias,
+        fill='toself',
+        name='Impacto',
+        line_color='#0078D4'
+    ))
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 10]
+            )
+        ),
+        title=f"Dimensiones de impacto para {pais}",
+        height=400,
+        margin=dict(t=50, b=0, l=0, r=0)
+    )
+    return fig
+
+
+def figura_radar_paises(impacto_paises):
+    # Radar con una traza por país (una fila de la matriz de impacto); el menú
+    # de Plotly alterna la visibilidad en el navegador, sin reruns ni tráfico
+    # por websocket.
+    paises = impacto_paises['País'].tolist()
+    categorias = [c for c in impacto_paises.columns if c != 'País']
+    valores = impacto_paises[categorias].to_numpy()
+    fig = go.Figure()
+
+    for i, pais in enumerate(paises):
+        fig.add_trace(go.Scatterpolar(
+            r=valores[i],
+            theta=categorias,
+            fill='toself',
+            name=pais,
+            line_color='#0078D4',
+            visible=i == 0
+        ))
+
+    botones = [
+        dict(
+            label=pais,
+            method='update',
+            args=[
+                {'visible': [j == i for j in range(len(paises))]},
+                {'title.text': f"Dimensiones de impacto para {pais}"}
+            ]
+        )
+        for i, pais in enumerate(paises)
+    ]
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 10]
+            )
+        ),
+        title=f"Dimensiones de impacto para {paises[0]}" if paises else None,
+        updatemenus=[dict(
+            buttons=botones,
+            direction='down',
+            showactive=True,
+            x=1,
+            xanchor='right',
+            y=1.15,
+            yanchor='top'
+        )],
+        showlegend=False,
+        height=400,
+        margin=dict(t=50, b=0, l=0, r=0)
+    )
+    return fig
+
+
+def figura_areas(areas_criticas):
+    # Gráfico de burbujas para áreas críticas
+    fig = px.scatter(
+        areas_criticas,
+        x='Área',
+        y='Impacto LATAM',
+        size='Indicador Actual',
+        color='Categoría',
+        color_discrete_sequence=px.colors.qualitative.Bold,
+        text='Tendencia',
+        hover_name='Área',
+        size_max=60,
+        height=450
+    )
+    fig.update_layout(
+        title='Variables críticas para monitoreo económico',
+        plot_bgcolor='white',
+        yaxis_title='Índice de Impacto LATAM',
+        xaxis_title='',
+        margin=dict(t=50, b=0, l=0, r=0)
+    )
+    return fig
+
+
+def figura_historial(area, fechas, valores):
+    # Serie ya reducida en el servidor (ver historial.py); WebGL para que el
+    # zoom y el hover sigan fluidos con cientos de puntos
+    fig = go.Figure(go.Scattergl(
+        x=fechas,
+        y=valores,
+        mode='lines',
+        name=area,
+        line=dict(color='rgb(0,104,201)', width=1.5),
+        hovertemplate='%{x|%d/%m/%Y %H:%M}<br>%{y:.2f}<extra></extra>'
+    ))
+    fig.update_layout(
+        title=f'Historial: {area}',
+        plot_bgcolor='white',
+        xaxis_title='',
+        yaxis_title='Indicador',
+        height=350,
+        margin=dict(t=50, b=0, l=0, r=0)
+    )
+    return fig
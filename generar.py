@@ -0,0 +1,132 @@
+"""Generación en lote de variantes del reporte, repartida en un pool de procesos.
+
+Cada variante (una semana y un recorte de países, ver ``plantilla.py``) se
+renderiza con ``exportar.renderizar_html`` en un proceso del pool, así que
+rehacer un año de reportes semanales, con sus versiones por subregión y por
+país, usa todos los núcleos en lugar de ir de a uno. Cada proceso carga los
+datos de una semana una sola vez y los reutiliza para todas sus variantes.
+
+La salida en PDF se dibuja sin JavaScript (figuras en SVG con kaleido) y se
+imprime con WeasyPrint; ambos son opcionales y sólo se piden con
+``--formatos pdf``.
+
+Uso:
+    python generar.py [--semanas 2025-03-01 ... | --todas] [--subregiones] [--paises [PAÍS ...]]
+                      [--formatos html pdf] [--procesos N] [--salida reportes/] [--plotlyjs cdn]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from pathlib import Path
+
+import almacen
+import geo
+from plantilla import Variante
+
+
+@lru_cache(maxsize=4)
+def _datos(semana_id):
+    from datos import cargar_datos
+
+    return cargar_datos(semana_id)
+
+
+def generar_variante(variante, formatos, plotlyjs, salida):
+    """Escribe los archivos de una variante; devuelve sus rutas y los segundos que tomó."""
+    from exportar import renderizar_html
+
+    inicio = time.perf_counter()
+    semana = almacen.buscar_semana(variante.semana_id)
+    datos = _datos(variante.semana_id)
+    archivos = []
+    if "html" in formatos:
+        ruta = Path(salida) / f"{variante.nombre}.html"
+        ruta.write_text(renderizar_html(semana, datos, plotlyjs, variante), encoding="utf-8")
+        archivos.append(ruta)
+    if "pdf" in formatos:
+        from weasyprint import HTML
+
+        ruta = Path(salida) / f"{variante.nombre}.pdf"
+        HTML(string=renderizar_html(semana, datos, "svg", variante), base_url=str(Path.cwd())).write_pdf(ruta)
+        archivos.append(ruta)
+    return archivos, time.perf_counter() - inicio
+
+
+def variantes(semanas, subregiones=False, paises=None):
+    """Variantes a generar, agrupadas por semana.
+
+    ``paises`` es una lista de países, o una lista vacía para todos los que
+    tienen detalle en cada semana.
+    """
+    for semana in semanas:
+        yield Variante(semana['id'])
+        if subregiones:
+            for subregion in geo.SUBREGIONES:
+                yield Variante(semana['id'], subregion=subregion)
+        if paises is not None:
+            con_detalle = paises or almacen.abrir_tabla(semana['id'], 'paises_detalle')['País'].to_pylist()
+            for pais in con_detalle:
+                yield Variante(semana['id'], pais=pais)
+
+
+def _verificar_pdf(parser):
+    faltantes = []
+    for modulo in ("weasyprint", "kaleido"):
+        try:
+            __import__(modulo)
+        except ImportError:
+            faltantes.append(modulo)
+    if faltantes:
+        parser.error(f"la salida en PDF requiere {' y '.join(faltantes)} (pip install {' '.join(faltantes)})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera variantes del reporte en paralelo.")
+    cuales = parser.add_mutually_exclusive_group()
+    cuales.add_argument("--semanas", nargs="+", help="Semanas a generar (por defecto, la más reciente).")
+    cuales.add_argument("--todas", action="store_true", help="Todas las semanas publicadas.")
+    parser.add_argument("--subregiones", action="store_true", help="Agrega una variante por subregión.")
+    parser.add_argument("--paises", nargs="*", choices=sorted(geo.ISO3), metavar="PAÍS",
+                        help="Agrega una variante por país (sin nombres, los países con detalle en cada semana).")
+    parser.add_argument("--formatos", nargs="+", choices=["html", "pdf"], default=["html"])
+    parser.add_argument("--plotlyjs", choices=["inline", "cdn"], default="cdn",
+                        help="plotly.js de los HTML: desde su CDN (por defecto) o embebido en cada archivo.")
+    parser.add_argument("--procesos", type=int, default=os.cpu_count(), help="Procesos del pool (por defecto, uno por CPU).")
+    parser.add_argument("--salida", default="reportes", help="Directorio de salida.")
+    args = parser.parse_args()
+    if "pdf" in args.formatos:
+        _verificar_pdf(parser)
+
+    indice = almacen.leer_indice()
+    if args.todas:
+        semanas = indice
+    elif args.semanas:
+        semanas = [almacen.buscar_semana(s) for s in args.semanas]
+    else:
+        semanas = indice[:1]
+    trabajos = list(variantes(semanas, args.subregiones, args.paises))
+    Path(args.salida).mkdir(parents=True, exist_ok=True)
+
+    inicio, fallidas = time.perf_counter(), 0
+    with ProcessPoolExecutor(args.procesos) as pool:
+        futuros = {pool.submit(generar_variante, v, args.formatos, args.plotlyjs, args.salida): v for v in trabajos}
+        for i, futuro in enumerate(as_completed(futuros), 1):
+            variante = futuros[futuro]
+            try:
+                archivos, segundos = futuro.result()
+            except Exception as error:  # una variante rota no detiene el lote
+                fallidas += 1
+                print(f"[{i}/{len(trabajos)}] {variante.nombre}: ERROR {type(error).__name__}: {error}", file=sys.stderr)
+                continue
+            print(f"[{i}/{len(trabajos)}] {', '.join(str(a) for a in archivos)} ({segundos:.1f} s)")
+
+    print(f"{len(trabajos) - fallidas} de {len(trabajos)} variantes en {time.perf_counter() - inicio:.1f} s "
+          f"con {args.procesos} procesos")
+    return 1 if fallidas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""Índice de países de América Latina y el Caribe y mapa base de la región.
+
+Los nombres del reporte están en español ("México", "Perú", ...) y el modo
+``'country names'`` de Plotly sólo reconoce nombres en inglés, por lo que esos
+países quedaban sin colorear sin ningún aviso. Aquí los nombres se resuelven
+una sola vez contra una tabla de códigos ISO-3 y el mapa usa ``'ISO-3'``.
+"""
+import unicodedata
+from functools import lru_cache
+
+from perfil import diferido
+
+go = diferido('plotly.graph_objects')
+
+# Las 33 economías de América Latina y el Caribe (nombre en español -> ISO-3)
+ISO3 = {
+    'Antigua y Barbuda': 'ATG', 'Argentina': 'ARG', 'Bahamas': 'BHS', 'Barbados': 'BRB',
+    'Belice': 'BLZ', 'Bolivia': 'BOL', 'Brasil': 'BRA', 'Chile': 'CHL', 'Colombia': 'COL',
+    'Costa Rica': 'CRI', 'Cuba': 'CUB', 'Dominica': 'DMA', 'Ecuador': 'ECU',
+    'El Salvador': 'SLV', 'Granada': 'GRD', 'Guatemala': 'GTM', 'Guyana': 'GUY',
+    'Haití': 'HTI', 'Honduras': 'HND', 'Jamaica': 'JAM', 'México': 'MEX',
+    'Nicaragua': 'NIC', 'Panamá': 'PAN', 'Paraguay': 'PRY', 'Perú': 'PER',
+    'República Dominicana': 'DOM', 'San Cristóbal y Nieves': 'KNA',
+    'San Vicente y las Granadinas': 'VCT', 'Santa Lucía': 'LCA', 'Surinam': 'SUR',
+    'Trinidad y Tobago': 'TTO', 'Uruguay': 'URY', 'Venezuela': 'VEN',
+}
+
+# Variantes y nombres en inglés que aparecen en las fuentes
+ALIAS = {
+    'Antigua and Barbuda': 'ATG', 'The Bahamas': 'BHS', 'Belize': 'BLZ', 'Brazil': 'BRA',
+    'Grenada': 'GRD', 'Haiti': 'HTI', 'Mexico': 'MEX', 'Panama': 'PAN', 'Peru': 'PER',
+    'Dominican Republic': 'DOM', 'Saint Kitts and Nevis': 'KNA',
+    'Saint Vincent and the Grenadines': 'VCT', 'Saint Lucia': 'LCA', 'Suriname': 'SUR',
+    'Trinidad and Tobago': 'TTO', 'Estado Plurinacional de Bolivia': 'BOL',
+    'República Bolivariana de Venezuela': 'VEN',
+}
+
+# Subregiones para las variantes del reporte (ver ``plantilla.py``)
+SUBREGIONES = {
+    'México y Centroamérica': [
+        'México', 'Belice', 'Costa Rica', 'El Salvador', 'Guatemala', 'Honduras', 'Nicaragua', 'Panamá',
+    ],
+    'El Caribe': [
+        'Antigua y Barbuda', 'Bahamas', 'Barbados', 'Cuba', 'Dominica', 'Granada', 'Guyana', 'Haití',
+        'Jamaica', 'República Dominicana', 'San Cristóbal y Nieves', 'San Vicente y las Granadinas',
+        'Santa Lucía', 'Surinam', 'Trinidad y Tobago',
+    ],
+    'Países andinos': ['Bolivia', 'Colombia', 'Ecuador', 'Perú', 'Venezuela'],
+    'Cono Sur': ['Argentina', 'Brasil', 'Chile', 'Paraguay', 'Uruguay'],
+}
+
+# Encuadre de la región completa, de México y el Caribe a Tierra del Fuego
+LATAXIS = [-56, 33]
+LONAXIS = [-118, -33]
+
+
+def normalizar(nombre):
+    """Minúsculas y sin tildes, para comparar nombres de países."""
+    sin_tildes = unicodedata.normalize('NFKD', nombre).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(sin_tildes.lower().split())
+
+
+_INDICE = {normalizar(nombre): codigo for nombre, codigo in {**ISO3, **ALIAS}.items()}
+
+
+def sin_codigo(nombres):
+    """Los nombres que no se reconocen como país (sin código ISO-3), en orden."""
+    return [nombre for nombre in nombres if normalizar(nombre) not in _INDICE]
+
+
+def codigos_iso3(nombres):
+    """Códigos ISO-3 de una serie de nombres; falla si alguno no se reconoce."""
+    codigos = nombres.map(lambda nombre: _INDICE.get(normalizar(nombre)))
+    faltantes = nombres[codigos.isna()].tolist()
+    if faltantes:
+        raise ValueError(f"Países sin código ISO-3: {', '.join(faltantes)}")
+    return codigos
+
+
+@lru_cache(maxsize=1)
+def mapa_base():
+    """Figura base del mapa de LATAM; se construye una vez por proceso.
+
+    Contiene la traza coroplética vacía y el encuadre de la región con la
+    geometría simplificada 1:110m de Plotly. Para graficar, se copia y sólo se
+    asignan ubicaciones y valores.
+    """
+    fig = go.Figure(go.Choropleth(
+        locationmode='ISO-3',
+        colorscale='Blues',
+        marker_line_color='white',
+        marker_line_width=0.5,
+        colorbar_title='Índice de<br>Impacto',
+        hovertemplate='%{customdata}<br>Impacto: %{z:.1f}<extra></extra>'
+    ))
+    fig.update_geos(
+        resolution=110,
+        projection_type='mercator',
+        lataxis_range=LATAXIS,
+        lonaxis_range=LONAXIS,
+        showcountries=True,
+        countrycolor='#DFDFDF',
+        showland=True,
+        landcolor='#F5F8FA',
+        showcoastlines=False,
+        showframe=False
+    )
+    fig.update_layout(
+        height=500,
+        title='Mapa de impacto potencial en Latinoamérica',
+        margin=dict(t=50, b=0, l=0, r=0)
+    )
+    return fig
@@ -0,0 +1,219 @@
+"""Series históricas de las variables de "Áreas Críticas", reducidas para graficar.
+
+Cada área tiene en ``archivo/historial/`` una tabla Arrow IPC con columnas
+``fecha`` y ``valor``, ordenada por fecha. Pueden ser años de datos diarios o
+intradiarios (millones de puntos por variable), así que nunca se grafican
+crudas: la ventana pedida se recorta con búsqueda binaria sobre la fecha y se
+reduce con LTTB (Largest-Triangle-Three-Buckets) a ``PUNTOS`` puntos, del
+orden del ancho del gráfico en píxeles. LTTB elige en cada tramo el punto que
+forma el triángulo más grande con sus vecinos, con lo que conserva picos,
+caídas y la forma de la serie. Al acercar la ventana se vuelve a reducir sólo
+el tramo visible, con más detalle.
+
+Las tablas se abren con ``pyarrow.memory_map`` como las del almacén: una serie
+larga no se copia en memoria y todas las sesiones comparten la misma.
+
+Uso:
+    python historial.py importar "Tasas de interés FED" serie.csv [--fecha fecha] [--valor valor]
+    python historial.py simular [--anios 5] [--frecuencia 1h]
+    python historial.py listar
+"""
+import argparse
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import almacen
+import geo
+from perfil import diferido
+
+np = diferido('numpy')
+pa = diferido('pyarrow')
+
+RUTA = almacen.RAIZ / "historial"
+PUNTOS = int(os.environ.get("MONITOR_HISTORIAL_PUNTOS", "800"))
+
+
+def ruta_serie(area, raiz=RUTA):
+    return Path(raiz) / f"{geo.normalizar(area).replace(' ', '-')}.arrow"
+
+
+def version(area, raiz=RUTA):
+    """Marca de la última escritura de la serie de ``area``, o ``None`` si no tiene historial."""
+    try:
+        return ruta_serie(area, raiz).stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def guardar(area, fechas, valores, raiz=RUTA):
+    """Escribe la serie de ``area`` ordenada por fecha, sin valores faltantes."""
+    fechas = np.asarray(fechas, dtype='datetime64[ns]')
+    valores = np.asarray(valores, dtype='float64')
+    validos = ~(np.isnat(fechas) | np.isnan(valores))
+    orden = np.argsort(fechas[validos], kind='stable')
+    tabla = pa.table({'fecha': fechas[validos][orden], 'valor': valores[validos][orden]},
+                     metadata={'area': area})
+    ruta = ruta_serie(area, raiz)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(prefix=".", suffix=".arrow", dir=ruta.parent)
+    os.close(descriptor)
+    with pa.OSFile(temporal, "wb") as sumidero:
+        with pa.ipc.new_file(sumidero, tabla.schema) as escritor:
+            escritor.write_table(tabla)
+    os.replace(temporal, ruta)
+    return len(tabla)
+
+
+class Serie:
+    """Serie histórica de un área, respaldada por mmap."""
+
+    def __init__(self, area, fechas, valores):
+        self.area = area
+        self.fechas = fechas  # int64, nanosegundos desde la época
+        self.valores = valores
+
+    def __len__(self):
+        return len(self.fechas)
+
+    @property
+    def inicio(self):
+        return _a_datetime(self.fechas[0])
+
+    @property
+    def fin(self):
+        return _a_datetime(self.fechas[-1])
+
+    def _tramo(self, desde, hasta):
+        # Las fechas están ordenadas: la ventana sale de dos búsquedas binarias
+        return slice(np.searchsorted(self.fechas, _a_ns(desde), 'left'),
+                     np.searchsorted(self.fechas, _a_ns(hasta), 'right'))
+
+    def contar(self, desde, hasta):
+        tramo = self._tramo(desde, hasta)
+        return tramo.stop - tramo.start
+
+    def reducida(self, desde, hasta, puntos=PUNTOS):
+        """Fechas (``datetime64``) y valores de la ventana, reducidos con LTTB a ``puntos`` como máximo."""
+        tramo = self._tramo(desde, hasta)
+        fechas, valores = self.fechas[tramo], self.valores[tramo]
+        elegidos = lttb(fechas, valores, puntos)
+        return fechas[elegidos].view('datetime64[ns]'), valores[elegidos]
+
+
+def abrir(area, raiz=RUTA):
+    """``Serie`` de ``area``; las columnas son vistas sobre el archivo, sin copia."""
+    with pa.memory_map(str(ruta_serie(area, raiz)), "r") as fuente:
+        tabla = pa.ipc.open_file(fuente).read_all()
+    fechas = tabla['fecha'].combine_chunks().cast(pa.int64()).to_numpy()
+    return Serie(area, fechas, tabla['valor'].combine_chunks().to_numpy())
+
+
+def cargar_serie(area, version, raiz=RUTA):
+    """Como ``abrir``; ``version`` sólo forma parte de la clave de caché."""
+    return abrir(area, raiz)
+
+
+def _a_ns(momento):
+    return np.datetime64(momento, 'ns').astype('int64')
+
+
+def _a_datetime(ns):
+    return np.datetime64(int(ns), 'ns').astype('datetime64[us]').astype(datetime)
+
+
+def lttb(x, y, puntos):
+    """Índices de los ``puntos`` de ``(x, y)`` que elige Largest-Triangle-Three-Buckets.
+
+    El primer y el último punto se conservan; el resto se parte en
+    ``puntos - 2`` tramos de igual cantidad de puntos y de cada uno se elige el
+    que forma el triángulo de mayor área con el punto elegido en el tramo
+    anterior y el promedio del tramo siguiente. Los promedios se calculan de
+    una vez con ``np.add.reduceat``; el recorrido por tramos es secuencial
+    porque cada elección depende de la anterior, pero dentro de cada tramo la
+    cuenta es vectorial.
+    """
+    n = len(x)
+    if puntos >= n or puntos < 3:
+        return np.arange(n)
+    # Relativas al primer punto, para no perder precisión en float64 con nanosegundos
+    x = (np.asarray(x) - x[0]).astype('float64')
+    y = np.asarray(y, dtype='float64')
+    bordes = np.linspace(1, n - 1, puntos - 1).astype('int64')
+    tamanos = np.diff(bordes)
+    medias_x = np.add.reduceat(x[:-1], bordes[:-1]) / tamanos
+    medias_y = np.add.reduceat(y[:-1], bordes[:-1]) / tamanos
+    # El "tramo siguiente" del último tramo es el último punto
+    medias_x = np.append(medias_x[1:], x[-1])
+    medias_y = np.append(medias_y[1:], y[-1])
+
+    elegidos = np.empty(puntos, dtype='int64')
+    elegidos[0], elegidos[-1] = 0, n - 1
+    a = 0
+    for i in range(puntos - 2):
+        inicio, fin = bordes[i], bordes[i + 1]
+        areas = np.abs((x[a] - medias_x[i]) * (y[inicio:fin] - y[a])
+                       - (x[a] - x[inicio:fin]) * (medias_y[i] - y[a]))
+        a = inicio + int(areas.argmax())
+        elegidos[i + 1] = a
+    return elegidos
+
+
+def _importar(args):
+    import pandas as pd
+
+    df = pd.read_csv(args.archivo, usecols=[args.fecha, args.valor])
+    n = guardar(args.area, pd.to_datetime(df[args.fecha]).to_numpy(), df[args.valor].to_numpy(), args.raiz)
+    print(f"{n} puntos de {args.area} guardados en {ruta_serie(args.area, args.raiz)}")
+
+
+def _simular(args):
+    # Paseos aleatorios que terminan hoy en el valor publicado, para probar la vista
+    import pandas as pd
+
+    semana = almacen.leer_indice()[0]
+    areas = almacen.abrir_tabla(semana['id'], 'areas_criticas').to_pandas()
+    fechas = pd.date_range(end=pd.Timestamp.now().floor(args.frecuencia),
+                           periods=int(pd.Timedelta(days=365 * args.anios) / pd.Timedelta(args.frecuencia)),
+                           freq=args.frecuencia).to_numpy()
+    generador = np.random.default_rng(args.semilla)
+    for area, actual in zip(areas['Área'], areas['Indicador Actual']):
+        pasos = generador.normal(0, 0.002, len(fechas))
+        valores = actual * np.exp(np.cumsum(pasos) - pasos.sum())
+        n = guardar(area, fechas, valores, args.raiz)
+        print(f"{area:<36} {n:>10} puntos")
+
+
+def _listar(args):
+    for ruta in sorted(Path(args.raiz).glob("*.arrow")):
+        with pa.memory_map(str(ruta), "r") as fuente:
+            lector = pa.ipc.open_file(fuente)
+            area = lector.schema.metadata[b'area'].decode('utf-8')
+            serie = abrir(area, args.raiz)
+        print(f"{area:<36} {len(serie):>10} puntos  {serie.inicio:%Y-%m-%d} a {serie.fin:%Y-%m-%d}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Series históricas de las Áreas Críticas.")
+    parser.add_argument("--raiz", default=RUTA, help="Directorio de las series.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    importar = sub.add_parser("importar", help="Guarda la serie de un área desde un CSV.")
+    importar.add_argument("area", help='Área tal como figura en la tabla, p. ej. "Tasas de interés FED".')
+    importar.add_argument("archivo", help="CSV con una columna de fecha y una de valor.")
+    importar.add_argument("--fecha", default="fecha", help="Columna de fecha (por defecto, fecha).")
+    importar.add_argument("--valor", default="valor", help="Columna de valor (por defecto, valor).")
+    importar.set_defaults(func=_importar)
+    simular = sub.add_parser("simular", help="Genera series de prueba para las áreas de la última semana.")
+    simular.add_argument("--anios", type=float, default=5)
+    simular.add_argument("--frecuencia", default="1h", help="Intervalo entre puntos (alias de pandas: 1h, 15min, 1D).")
+    simular.add_argument("--semilla", type=int, default=0)
+    simular.set_defaults(func=_simular)
+    listar = sub.add_parser("listar", help="Lista las series guardadas.")
+    listar.set_defaults(func=_listar)
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Matriz de impacto país × dimensión y puntaje compuesto.
+
+El impacto de cada país se guarda en una sola matriz NumPy (un país por fila,
+una dimensión por columna) con los ejes de países y dimensiones compartidos,
+en lugar de repetir la lista de categorías y el vector de cada país en un dict
+por país. El puntaje compuesto, el ranking y los valores del mapa salen de un
+único producto matriz-vector, así que agregar países (las 33 economías de
+``geo.ISO3``) o dimensiones no cambia el costo de forma apreciable.
+
+Los pesos de cada dimensión se configuran con ``MONITOR_PESOS_IMPACTO`` (JSON,
+p. ej. ``{"Comercio": 2, "Seguridad": 1.5}``); las dimensiones sin peso
+declarado pesan 1. Los pesos no pueden ser negativos ni sumar cero. El
+``Impacto`` de ``paises_data`` es este puntaje, de modo que la tabla, el mapa
+y el radar no pueden contradecirse.
+"""
+import json
+import os
+
+from perfil import diferido
+
+np = diferido('numpy')
+pd = diferido('pandas')
+
+
+def leer_pesos(texto):
+    """Pesos por dimensión a partir del JSON de ``MONITOR_PESOS_IMPACTO``."""
+    pesos = json.loads(texto)
+    if not isinstance(pesos, dict):
+        raise ValueError("MONITOR_PESOS_IMPACTO debe ser un objeto JSON dimensión -> peso")
+    for dimension, peso in pesos.items():
+        if isinstance(peso, bool) or not isinstance(peso, (int, float)) or peso < 0:
+            raise ValueError(f"MONITOR_PESOS_IMPACTO: el peso de {dimension!r} debe ser un número no negativo")
+    return pesos
+
+
+PESOS = leer_pesos(os.environ.get("MONITOR_PESOS_IMPACTO", "{}"))
+
+
+class MatrizImpacto:
+    """Impacto por país (filas) y dimensión (columnas), de 0 a 10."""
+
+    def __init__(self, paises, dimensiones, valores):
+        self.paises = tuple(paises)
+        self.dimensiones = tuple(dimensiones)
+        self.valores = np.asarray(valores, dtype=float)
+        self.valores.flags.writeable = False
+        self._posicion = {pais: i for i, pais in enumerate(self.paises)}
+
+    @classmethod
+    def desde_tabla(cls, df):
+        """Matriz a partir de una tabla con la columna ``País`` y una columna por dimensión."""
+        dimensiones = [c for c in df.columns if c != 'País']
+        return cls(df['País'], dimensiones, df[dimensiones].to_numpy(dtype=float))
+
+    def __len__(self):
+        return len(self.paises)
+
+    def __contains__(self, pais):
+        return pais in self._posicion
+
+    def fila(self, pais):
+        """Impacto de ``pais`` en cada dimensión, o ``None`` si no está en la matriz."""
+        posicion = self._posicion.get(pais)
+        return None if posicion is None else self.valores[posicion]
+
+    def subconjunto(self, paises):
+        """Matriz con sólo las filas de ``paises`` que están en ella, en el orden de la matriz."""
+        incluidos = set(paises)
+        filas = [i for i, pais in enumerate(self.paises) if pais in incluidos]
+        return MatrizImpacto([self.paises[i] for i in filas], self.dimensiones, self.valores[filas])
+
+    def tabla(self, paises=None):
+        """La matriz como DataFrame (``País`` y una columna por dimensión).
+
+        Con ``paises``, sólo los de esa lista que están en la matriz, en ese orden.
+        """
+        if paises is None:
+            filas, nombres = self.valores, self.paises
+        else:
+            nombres = [p for p in paises if p in self._posicion]
+            filas = self.valores[[self._posicion[p] for p in nombres]]
+        df = pd.DataFrame(filas, columns=list(self.dimensiones))
+        df.insert(0, 'País', nombres)
+        return df
+
+    def pesos(self, pesos=None):
+        """Vector de pesos alineado con ``dimensiones``."""
+        pesos = PESOS if pesos is None else pesos
+        desconocidas = set(pesos) - set(self.dimensiones)
+        if desconocidas:
+            raise ValueError(f"Dimensiones de impacto desconocidas: {', '.join(sorted(desconocidas))}")
+        w = np.array([float(pesos.get(d, 1.0)) for d in self.dimensiones])
+        if (w < 0).any() or w.sum() <= 0:
+            raise ValueError("Los pesos de impacto no pueden ser negativos ni sumar cero "
+                             f"(pesos de {', '.join(self.dimensiones)}: {w.tolist()})")
+        return w
+
+    def puntajes(self, pesos=None):
+        """Puntaje compuesto de cada país: promedio ponderado de sus dimensiones."""
+        w = self.pesos(pesos)
+        return self.valores @ (w / w.sum())
+
+    def resumen(self, pesos=None):
+        """``País``, ``Impacto`` (puntaje compuesto) y ``Ranking``, del mayor impacto al menor."""
+        puntajes = self.puntajes(pesos)
+        orden = np.argsort(-puntajes, kind='stable')
+        return pd.DataFrame({
+            'País': np.asarray(self.paises, dtype=object)[orden],
+            'Impacto': puntajes[orden],
+            'Ranking': np.arange(1, len(orden) + 1),
+        })
+
+    def con_impacto(self, df, pesos=None):
+        """``df`` con ``Impacto`` reemplazado por el puntaje compuesto.
+
+        Los países que no están en la matriz conservan el valor de ``df``. El
+        resto de las columnas no se copia, y la nueva es de sólo lectura, como
+        las que vienen del almacén.
+        """
+        puntajes = np.append(self.puntajes(pesos), np.nan)[[self._posicion.get(p, -1) for p in df['País']]]
+        impacto = np.where(np.isnan(puntajes), df['Impacto'], puntajes)
+        impacto.flags.writeable = False
+        # Como Series sin copia: un arreglo suelto pandas lo copiaría al asignarlo
+        return df.assign(Impacto=pd.Series(impacto, index=df.index, copy=False))
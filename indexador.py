@@ -0,0 +1,240 @@
+"""Índice invertido persistente de menciones sobre el corpus de documentos.
+
+Guarda en SQLite, para cada término (cada ``Tema`` y cada ``País``), la lista
+de documentos que lo mencionan con su fecha y cantidad de menciones. Al
+actualizar, sólo se leen los archivos nuevos o modificados (por tamaño y fecha
+de modificación) y los borrados salen del índice. Así, sumar otra tanda de
+documentos a mitad de semana no obliga a recontar el archivo completo. Un
+archivo que no se puede leer se registra sin menciones (con un aviso en el
+log) y no se vuelve a intentar hasta que cambie.
+
+Las ``Menciones`` de un rango de fechas (una semana del reporte, por ejemplo)
+se responden sumando las listas de cada término en ese rango, sin leer ningún
+documento. ``tabla`` devuelve las mismas listas fila por fila, para explorar
+los documentos detrás de cada conteo (ver ``explorador.py``).
+
+La fecha de un documento es la primera ``AAAA-MM-DD`` de su ruta dentro del
+corpus (``2025-03-04/nota.txt``, ``nota-2025-03-04.md``); si no tiene, la de su
+última modificación.
+
+Uso:
+    python indexador.py actualizar CORPUS [--procesos N]
+    python indexador.py consultar --desde 2025-03-01 --hasta 2025-03-07
+    python indexador.py publicar [--semana 2025-03-01]
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import re
+import sqlite3
+from collections import Counter
+from pathlib import Path
+
+import almacen
+import menciones
+
+RUTA = almacen.RAIZ / "menciones.sqlite"
+DIAS_SEMANA = 7
+LOTE_COMMIT = 256  # documentos por transacción al indexar
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS meta (clave TEXT PRIMARY KEY, valor TEXT);
+CREATE TABLE IF NOT EXISTS documentos (
+    id INTEGER PRIMARY KEY, ruta TEXT UNIQUE, fecha TEXT, mtime_ns INTEGER, tamano INTEGER
+);
+CREATE TABLE IF NOT EXISTS terminos (
+    id INTEGER PRIMARY KEY, tipo TEXT, nombre TEXT, UNIQUE (tipo, nombre)
+);
+CREATE TABLE IF NOT EXISTS posteos (
+    termino INTEGER, fecha TEXT, documento INTEGER, conteo INTEGER,
+    PRIMARY KEY (termino, fecha, documento)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS posteos_documento ON posteos (documento);
+"""
+
+
+def _fecha_documento(relativa, mtime_ns):
+    encontrada = re.search(r"\d{4}-\d{2}-\d{2}", relativa)
+    if encontrada:
+        return encontrada.group()
+    return datetime.date.fromtimestamp(mtime_ns / 1e9).isoformat()
+
+
+def _rango_semana(semana_id):
+    inicio = datetime.date.fromisoformat(semana_id)
+    return inicio, inicio + datetime.timedelta(days=DIAS_SEMANA - 1)
+
+
+def _huella_alias(entidades):
+    texto = json.dumps(sorted((tipo, nombre, sorted(alias)) for (tipo, nombre), alias in entidades.items()),
+                       ensure_ascii=False)
+    return hashlib.blake2b(texto.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class IndiceMenciones:
+    """Listas de documentos por término, guardadas en un archivo SQLite."""
+
+    def __init__(self, ruta=RUTA, entidades=None):
+        self.entidades = entidades or menciones.entidades_por_defecto()
+        self._conexion = sqlite3.connect(str(ruta))
+        self._conexion.executescript(ESQUEMA)
+        self._terminos = {(tipo, nombre): id_ for id_, tipo, nombre
+                          in self._conexion.execute("SELECT id, tipo, nombre FROM terminos")}
+        huella = _huella_alias(self.entidades)
+        anterior = self._conexion.execute("SELECT valor FROM meta WHERE clave = 'alias'").fetchone()
+        if anterior is None or anterior[0] != huella:
+            # Con otros alias los conteos guardados ya no valen: se reindexa todo
+            with self._conexion:
+                self._conexion.execute("DELETE FROM posteos")
+                self._conexion.execute("DELETE FROM documentos")
+                self._conexion.execute("INSERT OR REPLACE INTO meta VALUES ('alias', ?)", (huella,))
+
+    def close(self):
+        self._conexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _termino(self, entidad):
+        if entidad not in self._terminos:
+            cursor = self._conexion.execute("INSERT INTO terminos (tipo, nombre) VALUES (?, ?)", entidad)
+            self._terminos[entidad] = cursor.lastrowid
+        return self._terminos[entidad]
+
+    def _borrar(self, documento):
+        self._conexion.execute("DELETE FROM posteos WHERE documento = ?", (documento,))
+        self._conexion.execute("DELETE FROM documentos WHERE id = ?", (documento,))
+
+    def actualizar(self, corpus, procesos=None):
+        """Indexa los documentos nuevos o modificados del corpus y quita los borrados.
+
+        Devuelve ``(indexados, borrados, omitidos)``; los omitidos son los
+        documentos que no se pudieron leer, y cuentan también como indexados.
+        """
+        corpus = Path(corpus).resolve()
+        guardados = {ruta: (id_, mtime, tamano) for id_, ruta, mtime, tamano
+                     in self._conexion.execute("SELECT id, ruta, mtime_ns, tamano FROM documentos")}
+        pendientes = {}
+        for ruta in menciones.iterar_documentos(corpus):
+            estado = os.stat(ruta)
+            relativa = Path(ruta).relative_to(corpus).as_posix()
+            guardado = guardados.pop(relativa, None)
+            if guardado is None or guardado[1:] != (estado.st_mtime_ns, estado.st_size):
+                pendientes[ruta] = (relativa, estado, guardado and guardado[0])
+
+        with self._conexion:
+            for id_, *_ in guardados.values():
+                self._borrar(id_)
+
+        indexados = omitidos = 0
+        try:
+            for ruta, conteos in menciones.contar_documentos(pendientes, procesos, entidades=self.entidades):
+                relativa, estado, anterior = pendientes[ruta]
+                if anterior is not None:
+                    self._borrar(anterior)
+                fecha = _fecha_documento(relativa, estado.st_mtime_ns)
+                documento = self._conexion.execute(
+                    "INSERT INTO documentos (ruta, fecha, mtime_ns, tamano) VALUES (?, ?, ?, ?)",
+                    (relativa, fecha, estado.st_mtime_ns, estado.st_size)).lastrowid
+                if conteos is None:
+                    # Queda registrado con su tamaño y fecha: no se reintenta hasta que cambie
+                    omitidos += 1
+                else:
+                    self._conexion.executemany(
+                        "INSERT INTO posteos VALUES (?, ?, ?, ?)",
+                        [(self._termino(entidad), fecha, documento, n) for entidad, n in conteos.items()])
+                indexados += 1
+                if indexados % LOTE_COMMIT == 0:
+                    self._conexion.commit()
+        finally:
+            # Lo indexado hasta un error queda guardado; el resto se retoma en la próxima corrida
+            self._conexion.commit()
+        return indexados, len(guardados), omitidos
+
+    def menciones(self, desde, hasta):
+        """Menciones por ``(tipo, nombre)`` de los documentos fechados entre ``desde`` y ``hasta`` (inclusive)."""
+        filas = self._conexion.execute(
+            "SELECT t.tipo, t.nombre, SUM(p.conteo) FROM terminos t "
+            "JOIN posteos p ON p.termino = t.id AND p.fecha BETWEEN ? AND ? "
+            "GROUP BY t.id", (str(desde), str(hasta)))
+        return Counter({(tipo, nombre): total for tipo, nombre, total in filas})
+
+    def menciones_semana(self, semana_id):
+        """Menciones de la semana del almacén que empieza en ``semana_id``."""
+        return self.menciones(*_rango_semana(semana_id))
+
+    def tabla(self, desde, hasta):
+        """Una fila por término y documento fechado entre ``desde`` y ``hasta``, como tabla Arrow.
+
+        Columnas ``tipo``, ``nombre``, ``fecha``, ``documento`` (la ruta dentro
+        del corpus) y ``conteo``; ``tipo`` y ``nombre`` van codificadas como
+        diccionario, porque se repiten en todas las filas de cada término.
+        """
+        import pyarrow as pa
+
+        filas = self._conexion.execute(
+            "SELECT t.tipo, t.nombre, p.fecha, d.ruta, p.conteo FROM posteos p "
+            "JOIN terminos t ON t.id = p.termino JOIN documentos d ON d.id = p.documento "
+            "WHERE p.fecha BETWEEN ? AND ?", (str(desde), str(hasta))).fetchall()
+        tipo, nombre, fecha, documento, conteo = zip(*filas) if filas else ((),) * 5
+        return pa.table({
+            'tipo': pa.array(tipo, pa.string()).dictionary_encode(),
+            'nombre': pa.array(nombre, pa.string()).dictionary_encode(),
+            'fecha': pa.array(fecha, pa.string()),
+            'documento': pa.array(documento, pa.string()),
+            'conteo': pa.array(conteo, pa.int64()),
+        })
+
+    def tabla_semana(self, semana_id):
+        """``tabla`` de la semana del almacén que empieza en ``semana_id``."""
+        return self.tabla(*_rango_semana(semana_id))
+
+
+def _actualizar(args, indice):
+    indexados, borrados, omitidos = indice.actualizar(args.corpus, args.procesos)
+    print(f"{indexados} documentos indexados ({omitidos} ilegibles, omitidos), {borrados} quitados del índice")
+
+
+def _consultar(args, indice):
+    conteos = indice.menciones(args.desde, args.hasta)
+    for (tipo, nombre), total in sorted(conteos.items(), key=lambda par: (par[0][0], -par[1])):
+        print(f"{tipo:<5} {nombre:<32} {total:8d}")
+
+
+def _publicar(args, indice):
+    semana = almacen.buscar_semana(args.semana) if args.semana else almacen.leer_indice()[0]
+    # Las tablas guardadas, no las del reporte (ver ``menciones.main``)
+    temas_data, paises_data = menciones.tablas_menciones(
+        indice.menciones_semana(semana['id']),
+        *(almacen.abrir_tabla(semana['id'], tabla).to_pandas() for tabla in ('temas', 'paises')))
+    almacen.reemplazar_tablas(semana['id'], {'temas': temas_data, 'paises': paises_data})
+    print(f"Menciones de {semana['periodo']} actualizadas en el almacén.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Índice invertido de menciones del corpus.")
+    parser.add_argument("--indice", default=RUTA, help="Archivo SQLite del índice.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    actualizar = sub.add_parser("actualizar", help="Indexa los documentos nuevos o modificados.")
+    actualizar.add_argument("corpus", help="Directorio con los documentos.")
+    actualizar.add_argument("--procesos", type=int, help="Procesos del pool (por defecto, uno por CPU).")
+    actualizar.set_defaults(func=_actualizar)
+    consultar = sub.add_parser("consultar", help="Menciones por término en un rango de fechas.")
+    consultar.add_argument("--desde", required=True, help="Fecha inicial (AAAA-MM-DD).")
+    consultar.add_argument("--hasta", required=True, help="Fecha final, inclusive (AAAA-MM-DD).")
+    consultar.set_defaults(func=_consultar)
+    publicar = sub.add_parser("publicar", help="Actualiza las Menciones de una semana del almacén.")
+    publicar.add_argument("--semana", help="Semana del almacén (por defecto, la más reciente).")
+    publicar.set_defaults(func=_publicar)
+    args = parser.parse_args()
+    with IndiceMenciones(args.indice) as indice:
+        args.func(args, indice)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Indicadores de "Áreas Críticas" refrescados en segundo plano.
+
+El ``Indicador Actual`` publicado con la semana es una foto del día de cierre.
+Con ``MONITOR_INDICADORES`` (un archivo JSON local o una URL que devuelva JSON)
+un hilo del proceso vuelve a leer los indicadores cada
+``MONITOR_INDICADORES_INTERVALO`` segundos (300 por defecto), y el reporte
+muestra siempre la última lectura buena:
+
+- las corridas nunca esperan a la fuente: leen la instantánea vigente, aunque
+  esté vencida, y a lo sumo despiertan al hilo para que la renueve;
+- hay un solo hilo por proceso, así que muchas sesiones a la vez no disparan
+  lecturas duplicadas;
+- si una lectura falla o tarda, se conserva la instantánea anterior.
+
+La fuente devuelve ``{"Área": valor, ...}`` o ``{"indicadores": {...}}``; las
+áreas que no trae conservan el valor publicado. Para pruebas,
+``python indicadores.py servir`` levanta una fuente simulada que hace variar
+los valores de la semana publicada.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType
+
+ORIGEN = os.environ.get("MONITOR_INDICADORES")
+INTERVALO = float(os.environ.get("MONITOR_INDICADORES_INTERVALO", "300"))
+TIMEOUT = 10
+
+
+class Instantanea:
+    """Una lectura buena de la fuente: valores por área y hora de la lectura."""
+
+    def __init__(self, valores, leido):
+        self.valores = MappingProxyType(dict(valores))
+        self.leido = leido
+
+
+def leer_fuente(origen, timeout=TIMEOUT):
+    """Valores por área de un archivo JSON o de una URL ``http(s)://``."""
+    if origen.startswith(("http://", "https://")):
+        with urllib.request.urlopen(origen, timeout=timeout) as respuesta:
+            datos = json.load(respuesta)
+    else:
+        datos = json.loads(Path(origen).read_text(encoding="utf-8"))
+    datos = datos.get("indicadores", datos)
+    return {area: float(valor) for area, valor in datos.items()}
+
+
+class Refrescador:
+    """Mantiene la última instantánea buena de una fuente, leída por un hilo propio."""
+
+    def __init__(self, fuente, intervalo=INTERVALO):
+        self.fuente = fuente
+        self.intervalo = intervalo
+        self.error = None
+        self._instantanea = None
+        self._despertar = threading.Event()
+        self._aplicado = (None, None, None)  # (tabla, instantánea, resultado)
+        self._hilo = threading.Thread(target=self._bucle, name="indicadores", daemon=True)
+
+    def iniciar(self):
+        self._hilo.start()
+        return self
+
+    def _bucle(self):
+        while True:
+            try:
+                self._instantanea = Instantanea(self.fuente(), datetime.now())
+                self.error = None
+            except Exception as error:  # la fuente es externa: cualquier falla se reintenta
+                self.error = f"{type(error).__name__}: {error}"
+                print(f"No se pudieron refrescar los indicadores ({self.error}).", file=sys.stderr)
+            # Los pedidos que llegaron durante la lectura ya quedan atendidos por ella
+            self._despertar.clear()
+            self._despertar.wait(self.intervalo)
+
+    def ultima(self):
+        """Instantánea vigente (o ``None`` si todavía no hubo una lectura buena); nunca bloquea."""
+        instantanea = self._instantanea
+        vencida = instantanea is None or (datetime.now() - instantanea.leido).total_seconds() > self.intervalo
+        if vencida and self.error is None:
+            # Se sirve igual y se pide una lectura nueva al hilo; tras una
+            # falla se espera al intervalo, para no insistir con cada corrida
+            self._despertar.set()
+        return instantanea
+
+    def aplicar(self, areas_criticas):
+        """``areas_criticas`` con el ``Indicador Actual`` de la última instantánea.
+
+        El resultado se reutiliza mientras no cambien la tabla ni la
+        instantánea, así que todas las sesiones comparten la misma copia.
+        """
+        instantanea = self.ultima()
+        if instantanea is None:
+            return areas_criticas
+        tabla, usada, resultado = self._aplicado
+        if tabla is areas_criticas and usada is instantanea:
+            return resultado
+        resultado = areas_criticas.copy()
+        resultado['Indicador Actual'] = (
+            resultado['Área'].map(instantanea.valores).fillna(resultado['Indicador Actual'])
+        )
+        self._aplicado = (areas_criticas, instantanea, resultado)
+        return resultado
+
+
+_candado = threading.Lock()
+_refrescador = None
+
+
+def iniciar():
+    """Arranca, una sola vez por proceso, el refresco configurado por entorno."""
+    global _refrescador
+    with _candado:
+        if _refrescador is None and ORIGEN:
+            _refrescador = Refrescador(lambda: leer_fuente(ORIGEN)).iniciar()
+    return _refrescador
+
+
+def aplicar(areas_criticas):
+    """``areas_criticas`` con los indicadores vigentes, o tal cual si no hay refresco configurado."""
+    return _refrescador.aplicar(areas_criticas) if _refrescador is not None else areas_criticas
+
+
+def ultima():
+    return _refrescador.ultima() if _refrescador is not None else None
+
+
+# --- Fuente simulada ---
+
+def _servir(args):
+    import random
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    import almacen
+
+    semana = almacen.leer_indice()[0]
+    tabla = almacen.abrir_tabla(semana['id'], 'areas_criticas')
+    valores = dict(zip(tabla['Área'].to_pylist(), tabla['Indicador Actual'].to_pylist()))
+    candado = threading.Lock()
+
+    class Manejador(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with candado:
+                # Paseo aleatorio de hasta ±1% por lectura
+                for area in valores:
+                    valores[area] = round(valores[area] * (1 + random.uniform(-0.01, 0.01)), 2)
+                cuerpo = json.dumps({"indicadores": valores}, ensure_ascii=False).encode("utf-8")
+            time.sleep(args.demora)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def log_message(self, *args):
+            pass
+
+    print(f"Fuente simulada en http://127.0.0.1:{args.puerto}/ (MONITOR_INDICADORES=http://127.0.0.1:{args.puerto}/)")
+    ThreadingHTTPServer(("127.0.0.1", args.puerto), Manejador).serve_forever()
+
+
+def _consultar(args):
+    for area, valor in leer_fuente(args.origen).items():
+        print(f"{area:<36} {valor:10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Indicadores de Áreas Críticas.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    servir = sub.add_parser("servir", help="Levanta una fuente simulada con los valores de la última semana.")
+    servir.add_argument("--puerto", type=int, default=8765)
+    servir.add_argument("--demora", type=float, default=0, help="Segundos de espera por respuesta, para simular una fuente lenta.")
+    servir.set_defaults(func=_servir)
+    consultar = sub.add_parser("consultar", help="Lee la fuente una vez y muestra los valores.")
+    consultar.add_argument("origen", nargs="?", default=ORIGEN, help="Archivo JSON o URL (por defecto, MONITOR_INDICADORES).")
+    consultar.set_defaults(func=_consultar)
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""Conteo de menciones de temas y países sobre un corpus de documentos.
+
+Calcula la columna ``Menciones`` de ``temas_data`` y ``paises_data`` leyendo
+un directorio de noticias y documentos oficiales (``.txt``, ``.md``, ``.html``,
+``.json``/``.jsonl``) como flujo: los archivos se reparten por lotes entre un
+pool de procesos, y nunca hay más lotes en vuelo que los que pueden atenderse.
+
+Todos los alias (en español e inglés) se buscan en una sola pasada por
+documento. Se compilan en una única expresión regular con forma de trie
+(prefijos comunes factorizados), así que el motor de ``re`` avanza una vez
+por posición en lugar de probar cada alias. El texto se compara en minúsculas
+y sin tildes, y siempre gana la coincidencia más larga ("política energética"
+antes que "energética").
+
+Un documento que no se puede leer (un JSON mal formado, un archivo que
+desapareció a mitad de la corrida) se omite con un aviso en el log, sin
+cortar el conteo del resto.
+
+Uso:
+    python menciones.py CORPUS [--semana 2025-03-01] [--procesos N] [--publicar]
+"""
+import argparse
+import json
+import logging
+import os
+import re
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from pathlib import Path
+
+import geo
+
+_log = logging.getLogger(__name__)
+
+# Tema del reporte -> alias que cuentan como mención
+TEMAS = {
+    'Revisión arancelaria': [
+        'revisión arancelaria', 'arancel', 'aranceles', 'arancelaria', 'arancelarias', 'arancelario',
+        'arancelarios', 'tariff', 'tariffs', 'tariff review',
+    ],
+    'Política energética': [
+        'política energética', 'políticas energéticas', 'transición energética', 'energías renovables',
+        'energy policy', 'energy transition', 'renewable energy', 'clean energy',
+    ],
+    'Migración': [
+        'migración', 'migratoria', 'migratorias', 'migratorio', 'migratorios', 'migrantes',
+        'inmigración', 'migration', 'immigration', 'migrants', 'immigrants',
+    ],
+    'Seguridad regional': [
+        'seguridad regional', 'narcotráfico', 'crimen organizado', 'cooperación en seguridad',
+        'regional security', 'drug trafficking', 'organized crime', 'security cooperation',
+    ],
+    'Inversión tecnológica': [
+        'inversión tecnológica', 'inversiones tecnológicas', 'semiconductores', 'nearshoring',
+        'tech investment', 'technology investment', 'semiconductors',
+    ],
+}
+
+EXTENSIONES = {'.txt', '.md', '.html', '.htm', '.json', '.jsonl'}
+CAMPOS_TEXTO = ('titulo', 'title', 'texto', 'text', 'contenido', 'content', 'cuerpo', 'body')
+
+
+def _regex_trie(patrones):
+    """Expresión regular equivalente a la alternancia de ``patrones``, con forma de trie."""
+    trie = {}
+    for patron in patrones:
+        nodo = trie
+        for caracter in patron:
+            nodo = nodo.setdefault(caracter, {})
+        nodo[''] = {}
+
+    def expresion(nodo):
+        ramas = [re.escape(c) + expresion(hijo) for c, hijo in sorted(nodo.items()) if c]
+        if not ramas:
+            return ''
+        cuerpo = ramas[0] if len(ramas) == 1 else '(?:' + '|'.join(ramas) + ')'
+        # Si aquí termina un patrón, la continuación es opcional (y codiciosa:
+        # se prefiere la coincidencia más larga)
+        return f'(?:{cuerpo})?' if '' in nodo else cuerpo
+
+    return expresion(trie)
+
+
+class Buscador:
+    """Cuenta menciones de varias entidades con un único recorrido del texto."""
+
+    def __init__(self, entidades):
+        # entidades: {(tipo, nombre): [alias, ...]}
+        self._entidad = {}
+        for entidad, alias in entidades.items():
+            for texto in [entidad[1], *alias]:
+                self._entidad[geo.normalizar(texto)] = entidad
+        self._regex = re.compile(r'\b' + _regex_trie(self._entidad) + r'\b')
+
+    def contar(self, texto):
+        return Counter(self._entidad[m] for m in self._regex.findall(geo.normalizar(texto)))
+
+
+def entidades_por_defecto(alias_extra=None):
+    """Temas de ``TEMAS`` y los países de ``geo`` con sus alias en inglés."""
+    entidades = {('tema', tema): list(alias) for tema, alias in TEMAS.items()}
+    nombre_por_codigo = {codigo: nombre for nombre, codigo in geo.ISO3.items()}
+    for nombre in geo.ISO3:
+        entidades[('pais', nombre)] = []
+    for alias, codigo in geo.ALIAS.items():
+        entidades[('pais', nombre_por_codigo[codigo])].append(alias)
+    for tipo, por_nombre in (alias_extra or {}).items():
+        for nombre, alias in por_nombre.items():
+            entidades.setdefault((tipo, nombre), []).extend(alias)
+    return entidades
+
+
+def iterar_documentos(directorio):
+    """Rutas de los documentos del corpus, recorridas de forma perezosa."""
+    pendientes = [Path(directorio)]
+    while pendientes:
+        with os.scandir(pendientes.pop()) as entradas:
+            for entrada in entradas:
+                if entrada.is_dir(follow_symlinks=False):
+                    pendientes.append(Path(entrada.path))
+                elif Path(entrada.name).suffix.lower() in EXTENSIONES:
+                    yield entrada.path
+
+
+def leer_texto(ruta):
+    """Texto de un documento; de los JSON se toman los campos de texto habituales."""
+    contenido = Path(ruta).read_text(encoding='utf-8', errors='replace')
+    sufijo = Path(ruta).suffix.lower()
+    if sufijo in ('.html', '.htm'):
+        return re.sub(r'<[^>]+>', ' ', contenido)
+    if sufijo == '.jsonl':
+        return '\n'.join(_texto_json(json.loads(linea)) for linea in contenido.splitlines() if linea.strip())
+    if sufijo == '.json':
+        datos = json.loads(contenido)
+        return '\n'.join(_texto_json(d) for d in (datos if isinstance(datos, list) else [datos]))
+    return contenido
+
+
+def leer_documento(ruta):
+    """``leer_texto``, o ``None`` (con un aviso en el log) si el documento no se puede leer."""
+    try:
+        return leer_texto(ruta)
+    except (OSError, ValueError) as error:
+        _log.warning("Se omite %s: %s", ruta, error)
+        return None
+
+
+def _texto_json(registro):
+    return '\n'.join(str(registro[c]) for c in CAMPOS_TEXTO if isinstance(registro, dict) and c in registro)
+
+
+# --- Trabajo en el pool de procesos ---
+
+_buscador = None
+
+
+def _iniciar_proceso(entidades):
+    global _buscador
+    _buscador = Buscador(entidades)
+
+
+def _contar_lote(rutas):
+    conteos, leidos = Counter(), 0
+    for ruta in rutas:
+        texto = leer_documento(ruta)
+        if texto is not None:
+            conteos.update(_buscador.contar(texto))
+            leidos += 1
+    return conteos, leidos
+
+
+def _contar_lote_por_documento(rutas):
+    textos = [(ruta, leer_documento(ruta)) for ruta in rutas]
+    return [(ruta, None if texto is None else _buscador.contar(texto)) for ruta, texto in textos]
+
+
+def _lotes(iterable, tamano):
+    lote = []
+    for elemento in iterable:
+        lote.append(elemento)
+        if len(lote) == tamano:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def _en_pool(funcion, lotes, procesos, entidades):
+    """Resultados de ``funcion(lote)`` para cada lote, con a lo sumo dos lotes por proceso en vuelo."""
+    procesos = procesos or os.cpu_count() or 1
+    with ProcessPoolExecutor(procesos, initializer=_iniciar_proceso, initargs=(entidades,)) as pool:
+        en_vuelo = set()
+        for lote in lotes:
+            if len(en_vuelo) >= 2 * procesos:
+                listos, en_vuelo = wait(en_vuelo, return_when=FIRST_COMPLETED)
+                for futuro in listos:
+                    yield futuro.result()
+            en_vuelo.add(pool.submit(funcion, lote))
+        for futuro in as_completed(en_vuelo):
+            yield futuro.result()
+
+
+def contar_corpus(directorio, procesos=None, lote=64, entidades=None):
+    """Menciones por ``(tipo, nombre)`` y cantidad de documentos leídos."""
+    total, documentos = Counter(), 0
+    lotes = _lotes(iterar_documentos(directorio), lote)
+    for conteos, n in _en_pool(_contar_lote, lotes, procesos, entidades or entidades_por_defecto()):
+        total.update(conteos)
+        documentos += n
+    return total, documentos
+
+
+def contar_documentos(rutas, procesos=None, lote=64, entidades=None):
+    """``(ruta, menciones)`` de cada documento, a medida que se van contando.
+
+    Las menciones son ``None`` para los documentos que no se pudieron leer.
+    """
+    lotes = _lotes(rutas, lote)
+    for resultados in _en_pool(_contar_lote_por_documento, lotes, procesos, entidades or entidades_por_defecto()):
+        yield from resultados
+
+
+def tablas_menciones(conteos, temas_data, paises_data):
+    """``temas_data`` y ``paises_data`` con ``Menciones`` recalculada desde ``conteos``.
+
+    Se conservan las filas y el resto de las columnas del reporte, ordenadas
+    por menciones como en la versión publicada.
+    """
+    resultado = []
+    for df, tipo, columna in ((temas_data, 'tema', 'Tema'), (paises_data, 'pais', 'País')):
+        df = df.copy()
+        df['Menciones'] = [conteos.get((tipo, nombre), 0) for nombre in df[columna]]
+        resultado.append(df.sort_values('Menciones', ascending=False, kind='stable').reset_index(drop=True))
+    return tuple(resultado)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cuenta menciones de temas y países en un corpus.")
+    parser.add_argument("corpus", help="Directorio con los documentos de la semana.")
+    parser.add_argument("--semana", help="Semana del almacén cuyas tablas se actualizan (por defecto, la más reciente).")
+    parser.add_argument("--procesos", type=int, help="Procesos del pool (por defecto, uno por CPU).")
+    parser.add_argument("--alias", help='JSON con alias adicionales: {"tema": {"Tema": ["alias", ...]}, "pais": {...}}.')
+    parser.add_argument("--publicar", action="store_true", help="Guarda las tablas actualizadas en el almacén.")
+    args = parser.parse_args()
+
+    import almacen
+
+    alias = json.loads(Path(args.alias).read_text(encoding="utf-8")) if args.alias else None
+    conteos, documentos = contar_corpus(args.corpus, args.procesos, entidades=entidades_por_defecto(alias))
+    semana = almacen.buscar_semana(args.semana) if args.semana else almacen.leer_indice()[0]
+    # Se parte de las tablas guardadas, no de las del reporte: ``paises_data``
+    # lleva el ``Impacto`` recalculado con la matriz y no debe volver al almacén
+    temas_data, paises_data = tablas_menciones(
+        conteos, *(almacen.abrir_tabla(semana['id'], tabla).to_pandas() for tabla in ('temas', 'paises')))
+
+    print(f"{documentos} documentos leídos\n")
+    print(temas_data[['Tema', 'Menciones']].to_string(index=False), end="\n\n")
+    print(paises_data[['País', 'Menciones']].to_string(index=False))
+    if args.publicar:
+        almacen.reemplazar_tablas(semana['id'], {'temas': temas_data, 'paises': paises_data})
+        print(f"\nTablas de {semana['periodo']} actualizadas en el almacén.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""Métricas del camino crítico de cada corrida, en formato de texto de Prometheus.
+
+Se registran:
+
+- ``monitor_seccion_duracion_segundos``: cada sección del reporte (las marcas de
+  ``perfil.Cronometro``), por sección y tipo de interacción: ``carga`` (primera
+  corrida de la sesión), ``semana`` (cambio de semana), ``pagina`` (cambio de
+  página en la barra lateral), ``rerun`` (cualquier otra corrida completa),
+  ``pais`` (cambio de país en el fragmento del detalle), ``pestana`` (cambio
+  de pestaña en el fragmento de implicancias) y ``render`` (corridas de esos
+  fragmentos que no cambian de país ni de pestaña);
+- ``monitor_seccion_memoria_bytes``: variación de memoria residente del proceso
+  durante cada sección (sólo en Linux);
+- ``monitor_etapa_duracion_segundos``: cada etapa medida con ``medir`` —
+  construcción de datos y figuras (``cache.construir``), render de la tabla y
+  serialización de cada gráfico (``st.plotly_chart``).
+
+Cada serie es un histograma con buckets fijos, más los cuantiles p50/p95/p99
+de las últimas observaciones en ``<nombre>_cuantil``.
+
+Exportación (ver ``iniciar_exportacion``):
+
+- ``MONITOR_METRICAS_PUERTO=9464``: sirve ``/metrics`` en ese puerto;
+- ``MONITOR_METRICAS_ARCHIVO=/ruta/monitor.prom``: reescribe ese archivo cada
+  ``MONITOR_METRICAS_INTERVALO`` segundos (15 por defecto), para el recolector
+  de archivos de texto de node_exporter.
+"""
+import bisect
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import perfil
+
+BUCKETS_SEGUNDOS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BUCKETS_BYTES = tuple(2 ** n for n in range(16, 31, 2))  # 64 KiB .. 1 GiB
+CUANTILES = (0.5, 0.95, 0.99)
+MUESTRAS = 2048  # observaciones recientes por serie para calcular cuantiles
+
+AYUDA = {
+    "monitor_seccion_duracion_segundos": "Duración de cada sección del reporte.",
+    "monitor_seccion_memoria_bytes": "Variación de memoria residente durante cada sección.",
+    "monitor_etapa_duracion_segundos": "Duración de construcción, render y serialización por elemento.",
+}
+
+_log = logging.getLogger(__name__)
+_candado = threading.Lock()
+_series = {}  # (nombre, etiquetas) -> Histograma
+_exportando = False
+
+
+class Histograma:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.conteos = [0] * (len(buckets) + 1)
+        self.suma = 0.0
+        self.total = 0
+        self.recientes = deque(maxlen=MUESTRAS)
+
+    def observar(self, valor):
+        self.conteos[bisect.bisect_left(self.buckets, valor)] += 1
+        self.suma += valor
+        self.total += 1
+        self.recientes.append(valor)
+
+    def cuantiles(self):
+        ordenados = sorted(self.recientes)
+        if not ordenados:
+            return {}
+        return {q: ordenados[min(len(ordenados) - 1, int(q * len(ordenados)))] for q in CUANTILES}
+
+
+def observar(nombre, valor, buckets=BUCKETS_SEGUNDOS, **etiquetas):
+    clave = (nombre, tuple(sorted(etiquetas.items())))
+    with _candado:
+        serie = _series.get(clave)
+        if serie is None:
+            serie = _series[clave] = Histograma(buckets)
+        serie.observar(valor)
+
+
+@contextmanager
+def medir(etapa, elemento):
+    """Mide el bloque como ``monitor_etapa_duracion_segundos{etapa, elemento}``."""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        observar("monitor_etapa_duracion_segundos", time.perf_counter() - inicio,
+                 etapa=etapa, elemento=elemento)
+
+
+@contextmanager
+def seccion(nombre, interaccion):
+    """Mide un bloque como sección, para lo que corre fuera del ``Cronometro`` (fragmentos)."""
+    inicio, rss = time.perf_counter(), perfil.memoria_residente()
+    try:
+        yield
+    finally:
+        fin = perfil.memoria_residente()
+        _observar_seccion(nombre, time.perf_counter() - inicio,
+                          fin - rss if fin is not None and rss is not None else None, interaccion)
+
+
+@perfil.observar
+def _observar_seccion(seccion, segundos, rss_delta, interaccion):
+    observar("monitor_seccion_duracion_segundos", segundos, seccion=seccion, interaccion=interaccion)
+    if rss_delta is not None:
+        # Sólo interesa el crecimiento; las liberaciones cuentan como cero
+        observar("monitor_seccion_memoria_bytes", max(rss_delta, 0), BUCKETS_BYTES,
+                 seccion=seccion, interaccion=interaccion)
+
+
+def _etiquetas(pares):
+    if not pares:
+        return ""
+    texto = ",".join('{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in pares)
+    return "{" + texto + "}"
+
+
+def texto_prometheus():
+    """Todas las series en el formato de exposición de texto de Prometheus."""
+    with _candado:
+        series = sorted(_series.items())
+        instantanea = [(clave, serie.buckets, list(serie.conteos), serie.suma, serie.total, serie.cuantiles())
+                       for clave, serie in series]
+
+    lineas = []
+    nombres = sorted({clave[0] for clave, *_ in instantanea})
+    for nombre in nombres:
+        lineas += [f"# HELP {nombre} {AYUDA.get(nombre, nombre)}", f"# TYPE {nombre} histogram"]
+        for (n, pares), buckets, conteos, suma, total, _ in instantanea:
+            if n != nombre:
+                continue
+            acumulado = 0
+            for limite, conteo in zip((*buckets, "+Inf"), conteos):
+                acumulado += conteo
+                lineas.append(f"{nombre}_bucket{_etiquetas((*pares, ('le', limite)))} {acumulado}")
+            lineas.append(f"{nombre}_sum{_etiquetas(pares)} {suma}")
+            lineas.append(f"{nombre}_count{_etiquetas(pares)} {total}")
+        lineas += [f"# HELP {nombre}_cuantil Cuantiles de las últimas {MUESTRAS} observaciones.",
+                   f"# TYPE {nombre}_cuantil gauge"]
+        for (n, pares), *_, cuantiles in instantanea:
+            if n == nombre:
+                for q, valor in cuantiles.items():
+                    lineas.append(f"{nombre}_cuantil{_etiquetas((*pares, ('quantile', q)))} {valor}")
+    return "\n".join(lineas) + "\n"
+
+
+def _servir(puerto):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Manejador(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") != "/metrics":
+                self.send_error(404)
+                return
+            cuerpo = texto_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def log_message(self, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", puerto), Manejador)
+    threading.Thread(target=servidor.serve_forever, name="metricas-http", daemon=True).start()
+
+
+def _escribir_periodicamente(ruta, intervalo):
+    def bucle():
+        while True:
+            time.sleep(intervalo)
+            temporal = f"{ruta}.tmp"
+            # Un error de disco no debe cortar la exportación: se reintenta en
+            # el próximo intervalo
+            try:
+                with open(temporal, "w", encoding="utf-8") as f:
+                    f.write(texto_prometheus())
+                os.replace(temporal, ruta)
+            except OSError as error:
+                _log.warning("No se pudieron escribir las métricas en %s: %s", ruta, error)
+
+    threading.Thread(target=bucle, name="metricas-archivo", daemon=True).start()
+
+
+def iniciar_exportacion():
+    """Arranca, una sola vez por proceso, la exportación configurada por entorno."""
+    global _exportando
+    with _candado:
+        if _exportando:
+            return
+        _exportando = True
+    puerto = os.environ.get("MONITOR_METRICAS_PUERTO")
+    if puerto:
+        _servir(int(puerto))
+    ruta = os.environ.get("MONITOR_METRICAS_ARCHIVO")
+    if ruta:
+        _escribir_periodicamente(ruta, float(os.environ.get("MONITOR_METRICAS_INTERVALO", "15")))
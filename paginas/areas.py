@@ -0,0 +1,40 @@
+"""Sección 4: Áreas Críticas para Monitoreo."""
+import streamlit as st
+
+import almacen
+import figuras
+import indicadores
+import reporte
+from cache import construir_figura
+from secciones import historial_areas, mostrar_figura
+
+actual = reporte.actual()
+periodo, datos, textos = actual.periodo, actual.datos, actual.textos
+
+st.header("4. Áreas Críticas para Monitoreo")
+
+# Indicadores de la última lectura buena de la fuente, si hay refresco
+# configurado; sólo en la semana más reciente: las archivadas muestran lo publicado
+if actual.semana['id'] == almacen.leer_indice()[0]['id']:
+    areas_criticas = indicadores.aplicar(datos['areas_criticas'])
+    lectura = indicadores.ultima()
+else:
+    areas_criticas, lectura = datos['areas_criticas'], None
+
+col1, col2 = st.columns([3, 1])
+
+with col1:
+    fig = construir_figura(periodo, figuras.figura_areas, areas_criticas)
+    mostrar_figura(fig, "areas")
+    if lectura is not None:
+        st.caption(f"Indicadores actualizados el {lectura.leido:%d/%m/%Y a las %H:%M}")
+
+with col2:
+    st.subheader("Próximos indicadores a vigilar")
+    st.markdown(textos['proximos_indicadores'])
+
+# Series históricas de cada variable, si hay (ver historial.py)
+historial_areas(periodo, list(areas_criticas['Área']))
+
+# Añadir análisis final de áreas críticas
+st.markdown(textos['implicaciones_areas'])
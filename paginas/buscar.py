@@ -0,0 +1,48 @@
+"""Búsqueda en los textos de todas las semanas publicadas (ver busqueda.py)."""
+import time
+
+import streamlit as st
+
+import busqueda
+import reporte
+from cache import construir
+
+actual = reporte.actual()
+paginas = {pagina.title: pagina for pagina, _ in actual.secciones}
+
+
+def _ir_a_semana(semana_id):
+    # Antes del rerun, para que el selector de semana ya la muestre
+    st.session_state["semana"] = semana_id
+
+
+st.header("Buscar en el archivo")
+
+col1, col2 = st.columns([3, 1])
+with col1:
+    consulta = st.text_input(
+        "Buscar",
+        placeholder='p. ej. "Vaca Muerta", T-MEC, arancel*',
+        label_visibility="collapsed",
+        key="busqueda"
+    )
+with col2:
+    solo_semana = st.toggle("Sólo esta semana", key="busqueda_semana")
+
+if consulta:
+    # Una conexión por proceso; se pone al día si se publicó otra semana
+    indice = construir(actual.periodo, busqueda.abrir_indice)
+    indice.al_dia()
+    inicio = time.perf_counter()
+    resultados = indice.buscar(consulta, limite=50, semana=actual.semana['id'] if solo_semana else None)
+    st.caption(f"{len(resultados)} resultados en {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+    for i, resultado in enumerate(resultados):
+        lugar = " · ".join(filter(None, [resultado.periodo, resultado.seccion, resultado.pais]))
+        st.markdown(f"**{lugar}**")
+        st.markdown(resultado.fragmento.replace("\n", "  \n"), unsafe_allow_html=True)
+        # Los textos con una clave que no está en ``busqueda.SECCIONES`` no tienen página
+        pagina = paginas.get(resultado.seccion)
+        if pagina is not None and st.button("Ver en el reporte", key=f"resultado-{i}",
+                                            on_click=_ir_a_semana, args=(resultado.semana,)):
+            st.switch_page(pagina)
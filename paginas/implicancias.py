@@ -0,0 +1,12 @@
+"""Sección 2: Detalle de Implicancias."""
+import streamlit as st
+
+import reporte
+from secciones import implicancias
+
+actual = reporte.actual()
+
+st.header("2. Detalle de Implicancias")
+
+# Sólo se construye la pestaña abierta (ver secciones.implicancias)
+implicancias(actual.periodo, actual.datos, actual.textos)
@@ -0,0 +1,47 @@
+"""Sección 3: Detalle por Países."""
+import streamlit as st
+
+import figuras
+import geo
+import reporte
+from cache import construir_figura
+from secciones import detalle_pais, detalle_pais_cliente, mostrar_figura, tabla_paises
+
+actual = reporte.actual()
+periodo, datos, textos = actual.periodo, actual.datos, actual.textos
+
+st.header("3. Detalle por Países")
+
+paises_data = datos['paises_data']
+country_data = datos['country_data']
+impacto = datos['impacto']
+
+# Mapa interactivo de Latinoamérica
+st.subheader("Impacto por país")
+
+# Todos los países de la matriz de impacto, no sólo los mencionados en la semana.
+# Un nombre que no se reconoce queda fuera del mapa en lugar de tirar la
+# sección; la exportación, en cambio, falla en ``geo.codigos_iso3``
+resumen = impacto.resumen()
+faltantes = geo.sin_codigo(resumen['País'])
+if faltantes:
+    st.warning(f"Sin ubicación en el mapa (nombre no reconocido): {', '.join(faltantes)}.")
+    resumen = resumen[~resumen['País'].isin(faltantes)]
+fig = construir_figura(periodo, figuras.figura_mapa, resumen)
+mostrar_figura(fig, "mapa")
+
+# Tabla de países
+st.subheader("Países mencionados esta semana")
+if paises_data.empty:
+    # Puede pasar en las variantes por subregión o país
+    st.info("Ningún país de este recorte fue mencionado esta semana.")
+else:
+    # Elegir una fila abre los documentos detrás de sus Menciones
+    tabla_paises(periodo, actual.semana['id'], paises_data)
+
+    # Detalle de países seleccionados
+    if actual.radar_cliente:
+        detalle_pais_cliente(periodo, country_data, impacto, textos['recomendaciones'])
+    else:
+        # Se re-ejecuta por sí solo al cambiar de país
+        detalle_pais(periodo, paises_data, country_data, impacto, textos['recomendaciones'])
@@ -0,0 +1,20 @@
+"""Resumen Ejecutivo: la página de inicio del reporte."""
+import streamlit as st
+
+import reporte
+
+actual = reporte.actual()
+textos = actual.textos
+
+st.markdown(f"""
+<div class="highlight">
+<h3>Resumen Ejecutivo</h3>
+<p>{textos['resumen_ejecutivo']}</p>
+</div>
+""", unsafe_allow_html=True)
+
+# Índice de las secciones, con los mismos enlaces que la barra lateral
+st.markdown("### Contenido")
+for pagina, descripcion in actual.secciones[1:]:
+    st.page_link(pagina, query_params=actual.parametros)
+    st.markdown(f"<span class='small-text'>{descripcion}</span>", unsafe_allow_html=True)
@@ -0,0 +1,27 @@
+"""Sección 1: Principales Temas."""
+import streamlit as st
+
+import figuras
+import reporte
+from cache import construir_figura
+from secciones import mostrar_figura
+
+actual = reporte.actual()
+periodo, datos, textos = actual.periodo, actual.datos, actual.textos
+
+st.header("1. Principales Temas")
+
+temas_data = datos['temas_data']
+
+col1, col2 = st.columns([2, 1])
+
+with col1:
+    fig = construir_figura(periodo, figuras.figura_temas, temas_data)
+    mostrar_figura(fig, "temas")
+
+with col2:
+    st.subheader("Hallazgos clave")
+    st.markdown(textos['hallazgos_temas'])
+
+# Detalles de los temas principales
+st.markdown(textos['analisis_temas'])
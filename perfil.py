@@ -0,0 +1,140 @@
+"""Carga diferida de módulos pesados y perfil de arranque del reporte.
+
+pandas, pyarrow, NumPy y plotly.express suman más de un segundo de importación.
+Los módulos del reporte los declaran con ``diferido(...)``, y la importación
+real ocurre recién cuando una sección los usa. Así el encabezado llega al
+navegador antes de pagar ese costo.
+
+Con ``MONITOR_PERFIL=1`` se registra cuánto tardó cada importación diferida y
+el primer render de cada sección. El reporte se muestra en la barra lateral y
+se escribe en stderr al terminar la primera corrida del proceso. Con
+``MONITOR_PRESUPUESTO_MS`` se marca si el arranque excede el presupuesto.
+"""
+import importlib
+import os
+import sys
+import threading
+import time
+
+ACTIVO = os.environ.get("MONITOR_PERFIL") == "1"
+PRESUPUESTO_MS = float(os.environ.get("MONITOR_PRESUPUESTO_MS", "0")) or None
+
+_candado = threading.Lock()
+_importaciones = {}   # módulo -> segundos de su primera importación
+_primer_render = {}   # sección -> segundos de su primer render en el proceso
+_arranque = None      # segundos de la primera corrida completa
+_informado = False
+_observadores = []    # funciones llamadas con cada sección de cada corrida
+_PAGINA = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+class ModuloDiferido:
+    """Módulo que se importa al acceder a su primer atributo."""
+
+    def __init__(self, nombre):
+        self._nombre = nombre
+        self._modulo = None
+
+    def _cargar(self):
+        if self._modulo is None:
+            ya_cargado = self._nombre in sys.modules
+            inicio = time.perf_counter()
+            modulo = importlib.import_module(self._nombre)
+            if not ya_cargado:
+                with _candado:
+                    _importaciones.setdefault(self._nombre, time.perf_counter() - inicio)
+            self._modulo = modulo
+        return self._modulo
+
+    def __getattr__(self, atributo):
+        return getattr(self._cargar(), atributo)
+
+    def __repr__(self):
+        estado = "cargado" if self._modulo is not None else "diferido"
+        return f"<módulo {estado} {self._nombre!r}>"
+
+
+def diferido(nombre):
+    return ModuloDiferido(nombre)
+
+
+def memoria_residente():
+    """Memoria residente del proceso en bytes, o ``None`` fuera de Linux."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGINA
+    except OSError:
+        return None
+
+
+class Cronometro:
+    """Mide las secciones de una corrida del script, una tras otra.
+
+    ``seccion(nombre)`` cierra la sección en curso y abre la siguiente;
+    ``terminar()`` cierra la última. El primer render de cada sección en el
+    proceso queda registrado; cada duración se pasa además a los observadores
+    (ver ``observar``), junto con la variación de memoria residente y el tipo
+    de interacción que disparó la corrida.
+    """
+
+    def __init__(self, interaccion="carga"):
+        self.interaccion = interaccion
+        self._inicio = self._marca = time.perf_counter()
+        self._rss = memoria_residente()
+        self._actual = None
+
+    def seccion(self, nombre):
+        ahora = time.perf_counter()
+        rss = memoria_residente() if _observadores else None
+        if self._actual is not None:
+            duracion = ahora - self._marca
+            rss_delta = rss - self._rss if rss is not None and self._rss is not None else None
+            with _candado:
+                _primer_render.setdefault(self._actual, duracion)
+            for observador in list(_observadores):
+                observador(self._actual, duracion, rss_delta, self.interaccion)
+        self._actual, self._marca, self._rss = nombre, ahora, rss
+
+    def terminar(self):
+        global _arranque
+        self.seccion(None)
+        with _candado:
+            if _arranque is None:
+                _arranque = time.perf_counter() - self._inicio
+
+
+def observar(funcion):
+    """Registra ``funcion(seccion, segundos, rss_delta, interaccion)`` para cada sección de cada corrida."""
+    _observadores.append(funcion)
+    return funcion
+
+
+def dejar_de_observar(funcion):
+    _observadores.remove(funcion)
+
+
+def reporte():
+    """Filas (tipo, nombre, ms) con las importaciones y los primeros renders."""
+    with _candado:
+        filas = [("importación", nombre, s * 1000) for nombre, s in _importaciones.items()]
+        filas += [("primer render", nombre, s * 1000) for nombre, s in _primer_render.items()]
+        if _arranque is not None:
+            filas.append(("total", "primera corrida", _arranque * 1000))
+    return filas
+
+
+def excede_presupuesto():
+    return PRESUPUESTO_MS is not None and _arranque is not None and _arranque * 1000 > PRESUPUESTO_MS
+
+
+def informar():
+    """Escribe el reporte en stderr una sola vez por proceso."""
+    global _informado
+    with _candado:
+        if _informado or _arranque is None:
+            return
+        _informado = True
+    lineas = [f"  {tipo:<14} {nombre:<32} {ms:9.1f} ms" for tipo, nombre, ms in reporte()]
+    if excede_presupuesto():
+        lineas.append(f"  ¡Arranque por encima del presupuesto de {PRESUPUESTO_MS:.0f} ms!")
+    print("Perfil de arranque:\n" + "\n".join(lineas), file=sys.stderr)
@@ -0,0 +1,98 @@
+"""Variantes del reporte: qué semana y qué países cubre cada una.
+
+El reporte es una plantilla con dos parámetros, la semana (los datos y el
+período) y el recorte de países. La variante regional completa es la de
+siempre; una subregión (``geo.SUBREGIONES``) o un país limitan el mapa, la
+tabla, el detalle por país y la dinámica migratoria a esos países. El resto
+de las secciones es regional y no cambia.
+
+La aplicación toma la variante de la URL (``?semana=2025-03-01&subregion=Cono
+Sur`` o ``?pais=México``) y ``generar.py`` produce muchas en paralelo.
+"""
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
+
+import geo
+
+TITULO = "Reporte Semanal EEUU - Latinoamérica"
+
+# Datasets con una fila por país, que se recortan en cada variante
+POR_PAIS = ('paises_data', 'migracion_data', 'country_data', 'impacto')
+
+
+class Variante:
+    """Semana y recorte de países de una versión del reporte."""
+
+    def __init__(self, semana_id, subregion=None, pais=None):
+        if subregion is not None and subregion not in geo.SUBREGIONES:
+            raise ValueError(f"Subregión desconocida: {subregion}")
+        if pais is not None and pais not in geo.ISO3:
+            raise ValueError(f"País desconocido: {pais}")
+        self.semana_id = semana_id
+        self.subregion = subregion
+        self.pais = pais
+
+    @property
+    def paises(self):
+        """Países que cubre la variante, o ``None`` para toda la región."""
+        if self.pais is not None:
+            return (self.pais,)
+        if self.subregion is not None:
+            return tuple(geo.SUBREGIONES[self.subregion])
+        return None
+
+    @property
+    def titulo(self):
+        alcance = self.pais or self.subregion
+        return f"{TITULO}: {alcance}" if alcance else TITULO
+
+    @property
+    def nombre(self):
+        """Nombre de archivo de la variante, sin extensión."""
+        alcance = self.pais or self.subregion
+        sufijo = "-" + geo.normalizar(alcance).replace(" ", "-") if alcance else ""
+        return f"reporte-{self.semana_id}{sufijo}"
+
+    def __repr__(self):
+        return f"Variante({self.semana_id!r}, subregion={self.subregion!r}, pais={self.pais!r})"
+
+
+class DatosRecortados(Mapping):
+    """Vista de los datos de una semana limitada a ``paises``; cada recorte se hace una vez."""
+
+    def __init__(self, datos, paises):
+        self._datos = datos
+        self.paises = tuple(paises)
+        self._recortados = {}
+        self._candado = threading.Lock()
+
+    def __getitem__(self, nombre):
+        if nombre not in POR_PAIS:
+            return self._datos[nombre]
+        if nombre not in self._recortados:
+            with self._candado:
+                if nombre not in self._recortados:
+                    self._recortados[nombre] = self._recortar(nombre, self._datos[nombre])
+        return self._recortados[nombre]
+
+    def __iter__(self):
+        return iter(self._datos)
+
+    def __len__(self):
+        return len(self._datos)
+
+    def __repr__(self):
+        return f"DatosRecortados({self._datos!r}, {self.paises!r})"
+
+    def _recortar(self, nombre, valor):
+        if nombre == 'impacto':
+            return valor.subconjunto(self.paises)
+        if nombre == 'country_data':
+            return MappingProxyType({pais: detalle for pais, detalle in valor.items() if pais in self.paises})
+        return valor[valor['País'].isin(self.paises)].reset_index(drop=True)
+
+
+def recortar(datos, paises):
+    """``datos`` tal cual para toda la región, o su vista limitada a ``paises``."""
+    return datos if paises is None else DatosRecortados(datos, paises)
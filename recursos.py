@@ -0,0 +1,224 @@
+"""Recursos estáticos del reporte: hoja de estilos, fuentes y logo.
+
+La hoja de estilos, las fuentes y el logo se sirven desde ``static/``
+(``server.enableStaticServing`` en ``.streamlit/config.toml``) con nombres que
+incluyen un hash de su contenido, así que un proxy puede cachearlos
+indefinidamente (ver ``despliegue/nginx.conf``) y el navegador sólo los
+descarga otra vez cuando cambian. La página enlaza la hoja con ``<link>`` en
+lugar de incrustarla en cada corrida; si ``estilo.css`` cambió y ``static/``
+no se regeneró, se incrusta la versión actual.
+
+No hay ``@import`` remoto: la página carga igual en instalaciones sin acceso
+a internet. Una fuente que no esté vendorizada en ``static/`` cae en la pila
+de fuentes del sistema que declara ``estilo.css`` para su familia.
+
+``static/`` se genera con::
+
+    python recursos.py construir [--fuentes-css URL_O_ARCHIVO]
+
+que descarga Playfair Display y Source Sans Pro (por defecto desde Google Fonts;
+para instalaciones aisladas, desde un CSS local o un espejo, con las rutas de
+los woff2 relativas al CSS), escribe la hoja
+de estilos con sus ``@font-face`` y genera las variantes del logo en los
+tamaños que usa la página.
+"""
+import argparse
+import base64
+import hashlib
+import io
+import json
+import re
+import sys
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent
+ESTATICOS = RAIZ / "static"
+MANIFIESTO = ESTATICOS / "manifiesto.json"
+URL_ESTATICOS = "./app/static"
+
+LOGO = RAIZ / "logo lab.png"
+ANCHO_LOGO = 200
+
+FUENTES_CSS = (
+    "https://fonts.googleapis.com/css2?family=Playfair+Display:wght@400;700"
+    "&family=Source+Sans+Pro:wght@300;400;600&display=swap"
+)
+SUBCONJUNTOS = ("latin", "latin-ext")
+# Google Fonts sólo entrega woff2 a navegadores que lo declaran
+AGENTE = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+
+
+def _leer_manifiesto():
+    if MANIFIESTO.exists():
+        return json.loads(MANIFIESTO.read_text(encoding="utf-8"))
+    return {"fuentes": [], "logo": {}}
+
+
+ESTILO = (RAIZ / "estilo.css").read_text(encoding="utf-8")
+ACTIVOS = _leer_manifiesto()
+
+
+def _url(archivo):
+    return f"{URL_ESTATICOS}/{archivo}"
+
+
+def _data_uri(ruta, tipo):
+    return f"data:{tipo};base64," + base64.b64encode(ruta.read_bytes()).decode("ascii")
+
+
+def css_fuentes(embebidas=False, fuentes=None):
+    """Reglas ``@font-face`` de las fuentes vendorizadas (las del manifiesto, o ``fuentes``).
+
+    Con ``embebidas`` las fuentes van como data URI, para documentos
+    autocontenidos como la exportación estática. Nunca hay ``@import``
+    remoto: sin fuentes vendorizadas no hay reglas.
+    """
+    fuentes = ACTIVOS["fuentes"] if fuentes is None else fuentes
+    reglas = []
+    for fuente in fuentes:
+        origen = _data_uri(ESTATICOS / fuente["archivo"], "font/woff2") if embebidas else _url(fuente["archivo"])
+        regla = (
+            f"@font-face {{ font-family: '{fuente['familia']}'; font-style: {fuente['estilo']}; "
+            f"font-weight: {fuente['peso']}; font-display: swap; "
+            f"src: url({origen}) format('woff2');"
+        )
+        if fuente.get("unicode_range"):
+            regla += f" unicode-range: {fuente['unicode_range']};"
+        reglas.append(regla + " }")
+    return "\n".join(reglas)
+
+
+def hoja_estilo(fuentes=None):
+    """Hoja de estilos completa: fuentes y ``estilo.css``."""
+    return f"{css_fuentes(fuentes=fuentes)}\n{ESTILO}"
+
+
+def _nombre_con_hash(nombre, contenido):
+    base, extension = nombre.rsplit(".", 1)
+    return f"{base}.{hashlib.sha256(contenido).hexdigest()[:12]}.{extension}"
+
+
+def estilo_html():
+    """``<link>`` a la hoja de estilos de ``static/``, o la hoja incrustada si ``static/`` no está al día."""
+    css = hoja_estilo()
+    archivo = _nombre_con_hash("estilo.css", css.encode("utf-8"))
+    if ACTIVOS.get("estilo") == archivo:
+        return f'<link rel="stylesheet" href="{_url(archivo)}">'
+    return f"<style>\n{css}</style>"
+
+
+def logo_html(ancho=ANCHO_LOGO):
+    """Etiqueta ``<img>`` del logo con sus variantes 1x/2x, o ``None`` si no se generaron."""
+    variantes = ACTIVOS["logo"]
+    if not variantes:
+        return None
+    srcset = ", ".join(f"{_url(archivo)} {densidad}" for densidad, archivo in sorted(variantes.items()))
+    return f'<img src="{_url(variantes["1x"])}" srcset="{srcset}" width="{ancho}" alt="CEPAL Lab">'
+
+
+def logo_data_uri():
+    """Logo embebido como data URI, para documentos autocontenidos."""
+    if ACTIVOS["logo"]:
+        return _data_uri(ESTATICOS / ACTIVOS["logo"]["2x"], "image/png")
+    return _data_uri(LOGO, "image/png")
+
+
+# --- Construcción de static/ ---
+
+def _con_hash(nombre, contenido):
+    """Guarda ``contenido`` como ``<nombre>.<hash>.<ext>`` y devuelve el nombre final."""
+    archivo = _nombre_con_hash(nombre, contenido)
+    (ESTATICOS / archivo).write_bytes(contenido)
+    return archivo
+
+
+def _descargar(url):
+    peticion = urllib.request.Request(url, headers={"User-Agent": AGENTE})
+    with urllib.request.urlopen(peticion, timeout=30) as respuesta:
+        return respuesta.read()
+
+
+def _leer(origen, base=None):
+    """Contenido de una URL o de un archivo local (relativo a ``base``)."""
+    if base is not None and not re.match(r"^[a-z]+://", origen):
+        origen = urllib.parse.urljoin(base, origen) if re.match(r"^[a-z]+://", base) else str(Path(base).parent / origen)
+    if re.match(r"^[a-z]+://", origen):
+        return _descargar(origen)
+    return Path(origen).read_bytes()
+
+
+def _construir_fuentes(fuentes_css):
+    css = _leer(fuentes_css).decode("utf-8")
+    fuentes = []
+    # Cada bloque va precedido por un comentario con su subconjunto (/* latin */)
+    for subconjunto, bloque in re.findall(r"/\*\s*([\w-]+)\s*\*/\s*@font-face\s*{([^}]*)}", css):
+        if subconjunto not in SUBCONJUNTOS:
+            continue
+        propiedades = dict(re.findall(r"([\w-]+)\s*:\s*([^;]+);", bloque))
+        familia = propiedades["font-family"].strip("'\" ")
+        peso = propiedades["font-weight"].strip()
+        url = re.search(r"url\(([^)]+)\)", propiedades["src"]).group(1).strip("'\"")
+        nombre = f"{familia.replace(' ', '')}-{peso}-{subconjunto}.woff2"
+        fuentes.append({
+            "familia": familia,
+            "peso": peso,
+            "estilo": propiedades.get("font-style", "normal").strip(),
+            "unicode_range": propiedades.get("unicode-range", "").strip(),
+            "archivo": _con_hash(nombre, _leer(url, fuentes_css)),
+        })
+    return fuentes
+
+
+def _construir_logo():
+    from PIL import Image
+
+    original = Image.open(LOGO)
+    variantes = {}
+    for densidad, factor in (("1x", 1), ("2x", 2)):
+        ancho = min(ANCHO_LOGO * factor, original.width)
+        alto = round(original.height * ancho / original.width)
+        buffer = io.BytesIO()
+        original.resize((ancho, alto), Image.LANCZOS).save(buffer, format="PNG", optimize=True)
+        variantes[densidad] = _con_hash(f"logo-{ancho}.png", buffer.getvalue())
+    return variantes
+
+
+def construir(fuentes_css=FUENTES_CSS):
+    """Regenera ``static/`` y su manifiesto."""
+    ESTATICOS.mkdir(exist_ok=True)
+    anterior = _leer_manifiesto()
+    manifiesto = {"logo": _construir_logo()}
+    try:
+        manifiesto["fuentes"] = _construir_fuentes(fuentes_css)
+    except OSError as error:
+        # Sin acceso a las fuentes se conservan las que ya estaban vendorizadas
+        print(f"No se pudieron descargar las fuentes ({error}); se mantienen las actuales.", file=sys.stderr)
+        manifiesto["fuentes"] = anterior["fuentes"]
+    manifiesto["estilo"] = _con_hash("estilo.css", hoja_estilo(manifiesto["fuentes"]).encode("utf-8"))
+
+    vigentes = {MANIFIESTO.name, manifiesto["estilo"], *manifiesto["logo"].values(),
+                *(f["archivo"] for f in manifiesto["fuentes"])}
+    for ruta in ESTATICOS.iterdir():
+        # Las licencias de las fuentes (LICENCIA-*.txt) se conservan
+        if ruta.name not in vigentes and not ruta.name.startswith("LICENCIA"):
+            ruta.unlink()
+    MANIFIESTO.write_text(json.dumps(manifiesto, ensure_ascii=False, indent=2), encoding="utf-8")
+    return manifiesto
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recursos estáticos del reporte.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    comando = sub.add_parser("construir", help="Genera static/ con fuentes y logo con hash de contenido.")
+    comando.add_argument("--fuentes-css", default=FUENTES_CSS,
+                         help="CSS de Google Fonts (URL o archivo local) del que tomar las fuentes.")
+    args = parser.parse_args()
+    manifiesto = construir(args.fuentes_css)
+    print(f"static/: {len(manifiesto['fuentes'])} fuentes, {manifiesto['estilo']}, "
+          f"logo {', '.join(manifiesto['logo'].values())}")
+
+
+if __name__ == "__main__":
+    main()
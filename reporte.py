@@ -0,0 +1,39 @@
+"""Estado de la corrida que comparten ``output.py`` y las páginas de ``paginas/``.
+
+``output.py`` resuelve en cada corrida la semana, la variante y sus datos, y
+después ejecuta la página elegida en la barra lateral. Las páginas toman esos
+valores de aquí en lugar de volver a resolverlos: son referencias a los
+objetos de ``cache.py``, así que guardarlos en la sesión no copia datos.
+"""
+import streamlit as st
+
+_CLAVE = "_reporte"
+
+
+class Reporte:
+    """Semana, variante y datos de la corrida en curso."""
+
+    def __init__(self, semana, variante, datos, radar_cliente=False, secciones=(), parametros=None):
+        self.semana = semana
+        self.variante = variante
+        self.datos = datos
+        self.radar_cliente = radar_cliente
+        self.secciones = secciones  # (página, descripción) de cada sección
+        self.parametros = parametros or {}  # query params que se conservan al cambiar de página
+
+    @property
+    def periodo(self):
+        return self.semana['periodo']
+
+    @property
+    def textos(self):
+        return self.datos['textos']
+
+
+def fijar(reporte):
+    st.session_state[_CLAVE] = reporte
+
+
+def actual():
+    """El ``Reporte`` que fijó ``output.py`` en esta corrida."""
+    return st.session_state[_CLAVE]
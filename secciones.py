@@ -0,0 +1,267 @@
+"""Bloques del reporte que se ejecutan como unidades de rerun parcial, y
+ayudantes de render instrumentados."""
+import streamlit as st
+
+import explorador
+import figuras
+import historial
+import metricas
+from cache import construir, construir_figura, huella
+
+
+def mostrar_figura(fig, nombre):
+    """``st.plotly_chart`` midiendo la serialización de la figura (ver ``metricas.py``)."""
+    with metricas.medir("serializacion", nombre):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+@st.fragment
+def detalle_pais(periodo, paises_data, country_data, impacto, recomendaciones):
+    """Detalle de un país: resumen, radar de impacto y áreas clave.
+
+    Al ser un fragmento, cambiar ``selected_country`` sólo re-ejecuta esta
+    función y no el resto del reporte.
+    """
+    selected_country = st.selectbox("Seleccione un país para más detalles:", paises_data['País'])
+    # Un cambio de país re-ejecuta sólo este fragmento; se mide como interacción propia
+    interaccion = "pais" if st.session_state.get("pais_anterior", selected_country) != selected_country else "render"
+    st.session_state["pais_anterior"] = selected_country
+
+    # La tabla de la semana puede nombrar países sin fila en ``paises_detalle``
+    detalle = country_data.get(selected_country)
+
+    with metricas.seccion("Detalle de país", interaccion):
+        col1, col2 = st.columns([2, 1])
+
+        with col1:
+            if detalle is None:
+                st.info(f"No hay un resumen de {selected_country} para esta semana.")
+            else:
+                st.markdown(detalle['overview'])
+
+            fila = impacto.fila(selected_country)
+            if fila is None:
+                st.caption(f"Sin datos de impacto para {selected_country}.")
+            else:
+                fig = construir_figura(
+                    periodo,
+                    figuras.figura_radar,
+                    selected_country,
+                    fila.tolist(),
+                    list(impacto.dimensiones)
+                )
+
+                mostrar_figura(fig, "radar")
+
+        with col2:
+            st.markdown("### Áreas clave de atención")
+            for area in detalle['key_areas'] if detalle is not None else []:
+                st.markdown(f"• {area}")
+
+            st.markdown("### Recomendaciones")
+            st.markdown(recomendaciones)
+
+
+def detalle_pais_cliente(periodo, country_data, impacto, recomendaciones):
+    """Detalle de países resuelto por completo en el navegador.
+
+    Se envían de una vez las trazas de radar de todos los países y el cambio
+    de país lo hace el menú de Plotly; los textos van en pestañas, que también
+    se alternan del lado del cliente. Ninguna selección provoca un rerun.
+    Menú y pestañas muestran los mismos países: los que tienen resumen y fila
+    en la matriz de impacto.
+    """
+    matriz = impacto.tabla(country_data)
+    paises = matriz['País'].tolist()
+    if not paises:
+        st.info("Ningún país con resumen esta semana tiene datos de impacto.")
+        return
+
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        fig = construir_figura(periodo, figuras.figura_radar_paises, matriz)
+        mostrar_figura(fig, "radar_paises")
+
+    with col2:
+        st.markdown("### Recomendaciones")
+        st.markdown(recomendaciones)
+
+    for tab, pais in zip(st.tabs(paises), paises):
+        with tab:
+            st.markdown(country_data[pais]['overview'])
+            st.markdown("### Áreas clave de atención")
+            for area in country_data[pais]['key_areas']:
+                st.markdown(f"• {area}")
+
+
+@st.fragment
+def tabla_paises(periodo, semana_id, paises_data):
+    """Tabla de países; al elegir una fila se abren los documentos detrás de sus ``Menciones``.
+
+    Elegir una fila o pasar de página sólo re-ejecuta este fragmento.
+    """
+    with metricas.medir("render", "tabla_paises"):
+        evento = st.dataframe(
+            figuras.tabla_paises(paises_data, construir(periodo, figuras.colores_impacto, paises_data)),
+            height=300,
+            on_select="rerun",
+            selection_mode="single-row",
+            key="tabla_paises"
+        )
+    filas = [fila for fila in evento.selection.rows if fila < len(paises_data)]
+    if not filas:
+        st.caption("Seleccione un país de la tabla para ver los documentos que lo mencionan.")
+        return
+    menciones_documentos(periodo, semana_id, 'pais', paises_data['País'].iloc[filas[0]])
+
+
+def menciones_documentos(periodo, semana_id, tipo, nombre):
+    """Documentos que mencionan a ``nombre``, paginados en el servidor (ver ``explorador.py``)."""
+    version = explorador.version_indice()
+    if version is None:
+        st.info("Todavía no hay un índice de menciones; se arma con `python indexador.py actualizar CORPUS`.")
+        return
+    tabla = construir(periodo, explorador.cargar_menciones, semana_id, version)
+
+    st.markdown(f"#### Documentos que mencionan {nombre}")
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        texto = st.text_input("Filtrar por documento", key="filtro_menciones")
+    with col2:
+        orden = st.selectbox("Ordenar por", list(explorador.ORDENES), key="orden_menciones")
+    consulta = explorador.Consulta(tabla, tipo, nombre, texto)
+    if not len(consulta):
+        st.info("Ningún documento indexado de esta semana coincide.")
+        return
+
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        # La clave cambia con la consulta, así que otra consulta vuelve a la primera página
+        pagina = st.number_input("Página", min_value=1, max_value=consulta.paginas(), step=1,
+                                 key=f"pagina_menciones-{huella(tipo, nombre, texto, orden)}")
+        filas = consulta.pagina(pagina, orden)
+        st.dataframe(filas, hide_index=True)
+        inicio = (pagina - 1) * explorador.FILAS_POR_PAGINA
+        st.caption(f"Documentos {inicio + 1}–{inicio + len(filas)} de {len(consulta)}, "
+                   f"con {consulta.menciones} menciones en total")
+    with col2:
+        st.markdown("**Por día**")
+        st.dataframe(consulta.por_dia(), hide_index=True)
+        st.markdown("**Temas en los mismos documentos**")
+        st.dataframe(consulta.relacionados(), hide_index=True)
+
+
+@st.fragment
+def historial_areas(periodo, areas):
+    """Historial de una variable crítica, reducido en el servidor (ver ``historial.py``).
+
+    Cambiar de variable o mover la ventana sólo re-ejecuta este fragmento, y
+    cada ventana se vuelve a reducir con el mismo presupuesto de puntos: al
+    acercarla se ve más detalle sin enviar más datos.
+    """
+    versiones = {area: historial.version(area) for area in areas}
+    con_historial = [area for area, version in versiones.items() if version is not None]
+    if not con_historial:
+        return
+
+    st.subheader("Historial de indicadores")
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        area = st.selectbox("Variable", con_historial, key="historial_area")
+    serie = construir(periodo, historial.cargar_serie, area, versiones[area])
+    if not len(serie):
+        st.caption(f"La serie de {area} no tiene puntos.")
+        return
+    if serie.inicio == serie.fin:
+        # Con una sola fecha no hay ventana que elegir (y st.slider no la admite)
+        fechas, valores = serie.reducida(serie.inicio, serie.fin)
+        mostrar_figura(figuras.figura_historial(area, fechas, valores), "historial")
+        st.caption(f"Un solo registro, del {serie.inicio:%d/%m/%Y}")
+        return
+    with col2:
+        desde, hasta = st.slider(
+            "Ventana",
+            min_value=serie.inicio,
+            max_value=serie.fin,
+            value=(serie.inicio, serie.fin),
+            format="DD/MM/YYYY",
+            key=f"historial_ventana-{area}"
+        )
+    fechas, valores = serie.reducida(desde, hasta)
+    mostrar_figura(figuras.figura_historial(area, fechas, valores), "historial")
+    st.caption(f"{len(fechas)} de {serie.contar(desde, hasta)} puntos de la ventana, reducidos con LTTB")
+
+
+@st.fragment
+def implicancias(periodo, datos, textos):
+    """Pestañas de Comercio, Inversión, Migración y Seguridad.
+
+    Sólo se construye la pestaña abierta: cambiar de pestaña re-ejecuta este
+    fragmento, que arma y envía únicamente el contenido de la nueva.
+    """
+    pestanas = ["Comercio", "Inversión", "Migración", "Seguridad"]
+    tab1, tab2, tab3, tab4 = st.tabs(
+        pestanas,
+        key="implicancias",
+        on_change="rerun"
+    )
+    # Un cambio de pestaña re-ejecuta sólo este fragmento; se mide como interacción propia
+    abierta = next((nombre for nombre, tab in zip(pestanas, (tab1, tab2, tab3, tab4)) if tab.open), None)
+    interaccion = "pestana" if st.session_state.get("pestana_anterior", abierta) != abierta else "render"
+    st.session_state["pestana_anterior"] = abierta
+
+    with metricas.seccion("Detalle de implicancias", interaccion):
+        if tab1.open:
+            with tab1:
+                st.subheader("Impacto Comercial")
+
+                col1, col2 = st.columns([2, 1])
+
+                with col1:
+                    fig = construir_figura(periodo, figuras.figura_comercio, datos['comercio_df'])
+                    mostrar_figura(fig, "comercio")
+
+                with col2:
+                    st.markdown(textos['comercio'])
+
+        if tab2.open:
+            with tab2:
+                st.subheader("Tendencias de Inversión")
+
+                col1, col2 = st.columns([3, 2])
+
+                with col1:
+                    fig = construir_figura(periodo, figuras.figura_inversion, datos['inversion_df'])
+                    mostrar_figura(fig, "inversion")
+
+                with col2:
+                    st.markdown(textos['inversion'])
+
+        if tab3.open:
+            with tab3:
+                st.subheader("Dinámica Migratoria")
+
+                fig = construir_figura(periodo, figuras.figura_migracion, datos['migracion_data'])
+                mostrar_figura(fig, "migracion")
+
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    st.markdown(textos['migracion_hallazgos'])
+
+                with col2:
+                    st.markdown(textos['migracion_perspectivas'])
+
+        if tab4.open:
+            with tab4:
+                st.subheader("Cooperación en Seguridad")
+
+                col1, col2 = st.columns([2, 1])
+
+                with col1:
+                    fig = construir_figura(periodo, figuras.figura_seguridad, datos['seguridad_data'])
+                    mostrar_figura(fig, "seguridad")
+
+                with col2:
+                    st.markdown(textos['seguridad'])
@@ -0,0 +1,165 @@
+"""Tendencias semana a semana calculadas a partir del historial del almacén.
+
+Las flechas de ``Tendencia`` (↑ → ↓) de ``paises_data`` y ``areas_criticas``
+salen de comparar el valor de cada semana con el promedio de las
+``MONITOR_TENDENCIA_VENTANA`` semanas anteriores (1 por defecto: la semana
+previa). Un cambio relativo mayor que el umbral es ↑, uno menor que su
+opuesto es ↓ y el resto →. Junto a la flecha se guardan la variación absoluta
+(``Δ <columna>``) y porcentual (``Δ% <columna>``) de cada columna seguida.
+
+El cálculo es vectorial: el historial de cada columna es una matriz semanas ×
+entidades, y un solo ``shift``/``rolling`` sobre ella da las variaciones de
+todas las entidades en todas las semanas a la vez, así que recalcular un
+archivo de varios años es una sola operación. Donde no hay con qué comparar
+(la primera semana de una entidad) se conserva la flecha publicada.
+
+Los umbrales se configuran por columna con ``MONITOR_TENDENCIA_UMBRALES``
+(JSON, p. ej. ``{"Menciones": 0.15, "Indicador Actual": 0.01}``); las columnas
+sin umbral declarado usan ``UMBRAL``.
+
+Uso:
+    python tendencias.py calcular [--semana 2025-03-08] [--ventana 4]
+    python tendencias.py publicar [--semanas 2025-03-08 ... | --todas] [--ventana 4]
+"""
+import argparse
+import json
+import os
+
+import almacen
+from perfil import diferido
+
+np = diferido('numpy')
+pd = diferido('pandas')
+
+UMBRAL = 0.05
+UMBRALES = json.loads(os.environ.get("MONITOR_TENDENCIA_UMBRALES", "{}"))
+VENTANA = int(os.environ.get("MONITOR_TENDENCIA_VENTANA", "1"))
+
+FLECHAS = ('↓', '→', '↑')
+
+# Dataset del reporte -> (tabla del almacén, entidad, columna de la Tendencia, columnas seguidas)
+SERIES = {
+    'paises_data': ('paises', 'País', 'Impacto', ('Menciones', 'Impacto')),
+    'areas_criticas': ('areas_criticas', 'Área', 'Indicador Actual', ('Indicador Actual',)),
+}
+
+
+def variaciones(historia, ventana=VENTANA, umbral=UMBRAL):
+    """Variación absoluta, relativa y flecha de cada celda de ``historia`` (semanas × entidades).
+
+    Cada semana se compara con el promedio de las ``ventana`` anteriores en
+    que la entidad tiene valor. Devuelve tres matrices NumPy con la forma de
+    ``historia``; las celdas sin valor o sin semanas previas quedan en NaN (y
+    sin flecha).
+    """
+    base = historia.shift(1).rolling(ventana, min_periods=1).mean().to_numpy()
+    delta = historia.to_numpy() - base
+    with np.errstate(divide='ignore', invalid='ignore'):
+        relativa = delta / np.abs(base)
+    # De 0 a 0 no hay cambio; de 0 a otro valor el cambio relativo es ±inf
+    relativa[(delta == 0) & (base == 0)] = 0.0
+    flechas = np.select([np.isnan(relativa), relativa > umbral, relativa < -umbral],
+                        [None, FLECHAS[2], FLECHAS[0]], FLECHAS[1])
+    return delta, relativa, flechas
+
+
+def historial(dataset, semanas=None):
+    """Tabla larga ``semana``, entidad y columnas seguidas de ``dataset``, en todas las ``semanas``.
+
+    Los valores son los que muestra el reporte (el ``Impacto`` de
+    ``paises_data`` es el de la matriz de impacto, ver ``datos.py``).
+    """
+    from datos import DatosSemana
+
+    _, entidad, _, columnas = SERIES[dataset]
+    ids = [s['id'] for s in (semanas or almacen.leer_indice())]
+    partes = [DatosSemana(semana_id)[dataset][[entidad, *columnas]].assign(semana=semana_id) for semana_id in ids]
+    return pd.concat(partes, ignore_index=True)
+
+
+def calcular(dataset, largo, ventana=VENTANA, umbrales=None):
+    """Tendencia y variaciones por ``(semana, entidad)`` a partir de la tabla larga de ``historial``."""
+    _, entidad, principal, columnas = SERIES[dataset]
+    umbrales = {**UMBRALES, **(umbrales or {})}
+    historias = {columna: largo.pivot(index='semana', columns=entidad, values=columna).sort_index().astype(float)
+                 for columna in columnas}
+    # Todas las columnas comparten semanas y entidades: la tabla larga sale de
+    # aplanar cada matriz, sin pasar por ``stack``
+    primera = historias[columnas[0]]
+    indice = pd.MultiIndex.from_product([primera.index, primera.columns], names=['semana', entidad])
+    resultado = {}
+    for columna, historia in historias.items():
+        delta, relativa, flechas = variaciones(historia, ventana, umbrales.get(columna, UMBRAL))
+        if columna == principal:
+            resultado['Tendencia'] = flechas.ravel()
+        resultado[f'Δ {columna}'] = delta.ravel().round(2)
+        resultado[f'Δ% {columna}'] = np.where(np.isinf(relativa), np.nan, relativa * 100).ravel().round(1)
+    # Sólo las celdas con valor en la semana
+    presentes = ~np.isnan(primera.to_numpy().ravel())
+    return pd.DataFrame(resultado, index=indice)[presentes]
+
+
+def aplicar(df, calculadas, entidad):
+    """``df`` (una semana) con la Tendencia y las variaciones de ``calculadas`` para esa semana.
+
+    ``calculadas`` va indexada por entidad; donde no hay Tendencia calculada
+    se conserva la publicada.
+    """
+    nuevas = calculadas.reindex(df[entidad])
+    df = df.copy()
+    for columna in nuevas.columns:
+        valores = nuevas[columna].to_numpy()
+        if columna == 'Tendencia' and 'Tendencia' in df:
+            valores = nuevas[columna].fillna(pd.Series(df['Tendencia'].to_numpy(), index=nuevas.index)).to_numpy()
+        df[columna] = valores
+    return df
+
+
+def _calculadas(args, dataset):
+    return calcular(dataset, historial(dataset), args.ventana)
+
+
+def _calcular(args):
+    semana_id = args.semana or almacen.leer_indice()[0]['id']
+    for dataset in SERIES:
+        calculadas = _calculadas(args, dataset).xs(semana_id, level='semana')
+        print(f"\n{dataset} ({semana_id}, ventana de {args.ventana} semanas)")
+        print(calculadas.to_string())
+
+
+def _publicar(args):
+    todas = almacen.leer_indice()
+    if args.todas:
+        semanas = [s['id'] for s in todas]
+    else:
+        semanas = args.semanas or [todas[0]['id']]
+    # Se calcula todo el historial de una vez y después se reparte por semana
+    calculadas = {dataset: _calculadas(args, dataset) for dataset in SERIES}
+    for semana_id in semanas:
+        tablas = {}
+        for dataset, (tabla, entidad, _, _) in SERIES.items():
+            publicada = almacen.abrir_tabla(semana_id, tabla).to_pandas()
+            tablas[tabla] = aplicar(publicada, calculadas[dataset].xs(semana_id, level='semana'), entidad)
+        almacen.reemplazar_tablas(semana_id, tablas)
+        print(f"Tendencias de {semana_id} publicadas.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tendencias semana a semana a partir del historial del almacén.")
+    parser.add_argument("--ventana", type=int, default=VENTANA,
+                        help="Semanas anteriores contra cuyo promedio se compara (por defecto, MONITOR_TENDENCIA_VENTANA o 1).")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    calcular_ = sub.add_parser("calcular", help="Muestra las tendencias de una semana sin escribirlas.")
+    calcular_.add_argument("--semana", help="Semana del almacén (por defecto, la más reciente).")
+    calcular_.set_defaults(func=_calcular)
+    publicar = sub.add_parser("publicar", help="Escribe Tendencia y variaciones en el almacén.")
+    cuales = publicar.add_mutually_exclusive_group()
+    cuales.add_argument("--semanas", nargs="+", help="Semanas a actualizar (por defecto, la más reciente).")
+    cuales.add_argument("--todas", action="store_true", help="Todas las semanas publicadas.")
+    publicar.set_defaults(func=_publicar)
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()